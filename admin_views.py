@@ -0,0 +1,560 @@
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash
+from flask_login import login_required, current_user
+from models import db, User, Student, Staff, Enquiry, Receptionist, Course, Subject, AuditLog, RevenueRollup
+from metrics import dashboard_metrics
+from audit import archive_table, archived_periods
+from search import search_hits
+from catalog import catalog
+from settings import settings
+from profiling import request_profiler, HISTOGRAM_BUCKETS_MS
+import scheduling
+from passwords import HashingOverloaded
+from view_helpers import parse_date, log_action
+from datetime import datetime, timedelta, date
+
+# --- Admin Portal Routes ---
+bp = Blueprint('admin', __name__)
+
+AUDIT_LOG_PAGE_SIZE = 100
+
+@bp.route('/admin_portal')
+@login_required
+def admin_portal():
+    if current_user.role == 'admin':
+        metrics = dashboard_metrics.get()
+
+        return render_template(
+            'admin_portal.html',
+            total_students=metrics['total_students'],
+            total_staff=metrics['total_staff'],
+            fees_collected=metrics['fees_collected'],
+            pending_fees=metrics['pending_fees'],
+            current_user=current_user
+        )
+    return redirect(url_for('auth.login'))
+
+@bp.route('/admin_portal/manage_users', methods=['GET', 'POST'])
+@login_required
+def manage_users():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+
+    # The profile joins double as the source of each row's display name.
+    query = User.query.join(Staff, isouter=True).join(Receptionist, isouter=True).options(
+        db.contains_eager(User.staff_profile), db.contains_eager(User.receptionist_profile)
+    )
+    search_query = request.form.get('search_query')
+    role_filter = request.form.get('role_filter')
+
+    if request.method == 'POST':
+        within = None
+        if role_filter and role_filter != 'All':
+            query = query.filter(User.role == role_filter)
+            within = db.select(User.id).where(User.role == role_filter)
+        hits = search_hits('user_fts', search_query, within)
+        if hits is not None:
+            query = query.join(hits, hits.c.id == User.id).order_by(hits.c.rank)
+
+    users = query.all()
+    return render_template('manage_users.html', users=users, search_query=search_query, role_filter=role_filter)
+
+@bp.route('/admin_portal/add_user', methods=['GET', 'POST'])
+@login_required
+def add_user():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        role = request.form.get('role')
+        name = request.form.get('name')
+
+        existing_user = User.query.filter_by(username=username).first()
+        if existing_user:
+            flash(f"User '{username}' already exists. Please choose a different username.", 'danger')
+            return redirect(url_for('admin.add_user'))
+
+        new_user = User(username=username, role=role, is_active=True)
+        try:
+            new_user.set_password(password)
+        except HashingOverloaded:
+            flash("The server is busy. Please try again in a moment.", 'warning')
+            return redirect(url_for('admin.add_user'))
+        db.session.add(new_user)
+        db.session.commit()
+
+        if role == 'staff':
+            new_staff = Staff(name=name, user_id=new_user.id)
+            db.session.add(new_staff)
+        elif role == 'receptionist':
+            new_receptionist = Receptionist(name=name, user_id=new_user.id)
+            db.session.add(new_receptionist)
+
+        db.session.commit()
+        log_action(current_user, 'add_user', f"Created user '{username}' with role '{role}'.")
+        flash(f"User '{username}' with role '{role}' created successfully.", 'success')
+        return redirect(url_for('admin.admin_portal'))
+
+    return render_template('add_user.html')
+
+@bp.route('/admin_portal/edit_user/<int:user_id>', methods=['GET', 'POST'])
+@login_required
+def edit_user(user_id):
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+
+    user_to_edit = db.session.get(User, user_id)
+    if user_to_edit is None:
+        flash("User not found.", 'danger')
+        return redirect(url_for('admin.manage_users'))
+
+    if request.method == 'POST':
+        new_username = request.form.get('username')
+        new_password = request.form.get('password')
+        new_role = request.form.get('role')
+        name = request.form.get('name')
+
+        # Check if the new username already exists with another user
+        existing_user = User.query.filter(User.username == new_username, User.id != user_id).first()
+        if existing_user:
+            flash(f"Username '{new_username}' already in use.", 'danger')
+            return redirect(url_for('admin.edit_user', user_id=user_id))
+
+        user_to_edit.username = new_username
+        user_to_edit.role = new_role
+        
+        # Update associated profile name
+        if user_to_edit.staff_profile:
+            user_to_edit.staff_profile.name = name
+        elif user_to_edit.receptionist_profile:
+            user_to_edit.receptionist_profile.name = name
+        
+        if new_password:
+            try:
+                user_to_edit.set_password(new_password)
+            except HashingOverloaded:
+                db.session.rollback()
+                flash("The server is busy. Please try again in a moment.", 'warning')
+                return redirect(url_for('admin.edit_user', user_id=user_id))
+        
+        db.session.commit()
+        log_action(current_user, 'edit_user', f"Edited user '{user_to_edit.username}'.")
+        flash(f"User '{user_to_edit.username}' updated successfully.", 'success')
+        return redirect(url_for('admin.manage_users'))
+
+    return render_template('edit_user.html', user=user_to_edit)
+
+
+@bp.route('/admin_portal/delete_user/<int:user_id>', methods=['POST'])
+@login_required
+def delete_user(user_id):
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+        
+    user_to_delete = db.session.get(User, user_id)
+    if user_to_delete is None:
+        flash("User not found.", 'danger')
+        return redirect(url_for('admin.manage_users'))
+
+    if user_to_delete.role == 'admin':
+        flash("Cannot delete an admin account.", 'danger')
+        return redirect(url_for('admin.manage_users'))
+
+    if user_to_delete.role == 'staff' and user_to_delete.staff_profile:
+        db.session.delete(user_to_delete.staff_profile)
+    elif user_to_delete.role == 'receptionist' and user_to_delete.receptionist_profile:
+        db.session.delete(user_to_delete.receptionist_profile)
+
+    log_action(current_user, 'delete_user', f"Deleted user '{user_to_delete.username}'.")
+    db.session.delete(user_to_delete)
+    db.session.commit()
+    flash(f"User '{user_to_delete.username}' and associated profile deleted successfully.", 'success')
+    return redirect(url_for('admin.manage_users'))
+
+@bp.route('/admin_portal/toggle_active/<int:user_id>', methods=['POST'])
+@login_required
+def toggle_active(user_id):
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+
+    user_to_toggle = db.session.get(User, user_id)
+    if user_to_toggle is None:
+        flash("User not found.", 'danger')
+    elif user_to_toggle.role == 'admin':
+        flash("Cannot deactivate an admin account.", 'danger')
+    else:
+        user_to_toggle.is_active = not user_to_toggle.is_active
+        db.session.commit()
+        status = 'deactivated' if not user_to_toggle.is_active else 'activated'
+        log_action(current_user, 'toggle_active', f"{user_to_toggle.username} {status}.")
+        flash(f"User '{user_to_toggle.username}' has been {status}.", 'success')
+    return redirect(url_for('admin.manage_users'))
+
+@bp.route('/admin_portal/manage_students', methods=['GET', 'POST'])
+@login_required
+def manage_students():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+    
+    query = Student.query.join(Enquiry).options(db.contains_eager(Student.enquiry))
+    search_query = request.form.get('search_query')
+    course_filter = request.form.get('course_filter')
+    
+    if request.method == 'POST':
+        within = None
+        if course_filter and course_filter != 'All':
+            query = query.filter(Enquiry.course_interest == course_filter)
+            within = db.select(Student.id).join(Enquiry).where(Enquiry.course_interest == course_filter)
+        hits = search_hits('student_fts', search_query, within)
+        if hits is not None:
+            query = query.join(hits, hits.c.id == Student.id).order_by(hits.c.rank)
+            
+    students = query.all()
+    courses = catalog.courses()
+    return render_template('manage_students.html', students=students, courses=courses)
+
+@bp.route('/admin_portal/edit_student/<int:student_id>', methods=['GET', 'POST'])
+@login_required
+def edit_student(student_id):
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+    
+    student = db.session.get(Student, student_id)
+    if student is None:
+        flash("Student not found.", 'danger')
+        return redirect(url_for('admin.manage_students'))
+
+    if request.method == 'POST':
+        student.name = request.form.get('student_name')
+        student.father_name = request.form.get('father_name')
+        student.contact_no = request.form.get('contact_no')
+        student.father_contact_no = request.form.get('father_contact_no')
+        student.dob = request.form.get('dob')
+        student.full_address = request.form.get('full_address')
+        student.qualification = request.form.get('qualification')
+        student.exam_type = request.form.get('exam_type')
+        student.target_exam = request.form.get('target_exam')
+        
+        db.session.commit()
+        log_action(current_user, 'edit_student', f"Edited student '{student.name}'.")
+        flash(f"Student '{student.name}' profile updated successfully.", 'success')
+        return redirect(url_for('admin.manage_students'))
+
+    return render_template('edit_student.html', student=student)
+
+@bp.route('/admin_portal/financial_reports')
+@login_required
+def financial_reports():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+
+    granularity = request.args.get('granularity', 'month')
+    if granularity not in ('day', 'month'):
+        granularity = 'month'
+    try:
+        date_from = parse_date(request.args.get('date_from'))
+        date_to = parse_date(request.args.get('date_to'))
+    except ValueError:
+        flash("Invalid date range.", 'danger')
+        return redirect(url_for('admin.financial_reports'))
+    if granularity == 'day' and date_from is None:
+        date_from = (date_to or date.today()) - timedelta(days=30)
+
+    # Reads only the pre-aggregated rollup rows (courses x periods).
+    criteria = [RevenueRollup.granularity == granularity]
+    if date_from:
+        period_from = date_from.replace(day=1) if granularity == 'month' else date_from
+        criteria.append(RevenueRollup.period_start >= period_from)
+    if date_to:
+        criteria.append(RevenueRollup.period_start <= date_to)
+
+    revenue_by_course = db.session.query(
+        RevenueRollup.course.label('course_interest'),
+        db.func.sum(RevenueRollup.billed).label('total_fees'),
+        db.func.sum(RevenueRollup.collected).label('amount_paid')
+    ).filter(*criteria).group_by(RevenueRollup.course).order_by(RevenueRollup.course).all()
+
+    revenue_by_period = RevenueRollup.query.filter(*criteria).order_by(
+        RevenueRollup.period_start.desc(), RevenueRollup.course
+    ).all()
+
+    return render_template(
+        'financial_reports.html',
+        revenue_by_course=revenue_by_course,
+        revenue_by_period=revenue_by_period,
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to
+    )
+
+@bp.route('/admin_portal/institutional_settings', methods=['GET', 'POST'])
+@login_required
+def institutional_settings():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+    
+    if request.method == 'POST':
+        try:
+            discount = float(request.form.get('global_discount_percentage', ''))
+        except ValueError:
+            discount = None
+        if discount is None or not 0 <= discount <= 100:
+            flash("Global discount must be a percentage between 0 and 100.", 'danger')
+            return redirect(url_for('admin.institutional_settings'))
+
+        settings.set('global_discount_percentage', discount)
+        db.session.commit()
+        log_action(current_user, 'update_settings', f"Updated global discount to {discount}%.")
+        flash("Settings updated successfully.", 'success')
+        return redirect(url_for('admin.institutional_settings'))
+
+    return render_template('institutional_settings.html', settings=settings.all())
+
+
+@bp.route('/admin_portal/courses')
+@login_required
+def view_courses():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+    
+    courses = catalog.courses()
+    return render_template('view_courses.html', courses=courses)
+
+
+@bp.route('/admin_portal/add_course', methods=['GET', 'POST'])
+@login_required
+def add_course():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+
+    if request.method == 'POST':
+        course_name = request.form.get('course_name')
+        existing_course = Course.query.filter_by(name=course_name).first()
+
+        if existing_course:
+            flash("Course already exists.", 'danger')
+        else:
+            new_course = Course(name=course_name)
+            db.session.add(new_course)
+            db.session.commit()
+            log_action(current_user, 'add_course', f"Added new course '{course_name}'.")
+            flash(f"Course '{course_name}' added successfully.", 'success')
+        
+        return redirect(url_for('admin.view_courses'))
+    
+    return render_template('add_course.html')
+
+@bp.route('/admin_portal/edit_course/<int:course_id>', methods=['GET', 'POST'])
+@login_required
+def edit_course(course_id):
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+
+    course = db.session.get(Course, course_id)
+    if course is None:
+        flash("Course not found.", 'danger')
+        return redirect(url_for('admin.view_courses'))
+    
+    if request.method == 'POST':
+        new_name = request.form.get('course_name')
+        if new_name:
+            course.name = new_name
+            db.session.commit()
+            log_action(current_user, 'edit_course', f"Edited course ID {course_id} to '{new_name}'.")
+            flash("Course updated successfully.", 'success')
+            return redirect(url_for('admin.view_courses'))
+        else:
+            flash("Course name cannot be empty.", 'danger')
+
+    return render_template('edit_course.html', course=course)
+
+@bp.route('/admin_portal/delete_course/<int:course_id>', methods=['POST'])
+@login_required
+def delete_course(course_id):
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+
+    course_to_delete = db.session.get(Course, course_id)
+    if course_to_delete:
+        log_action(current_user, 'delete_course', f"Deleted course '{course_to_delete.name}'.")
+        db.session.delete(course_to_delete)
+        db.session.commit()
+        flash("Course and all associated subjects deleted successfully.", 'success')
+    else:
+        flash("Course not found.", 'danger')
+
+    return redirect(url_for('admin.view_courses'))
+
+
+@bp.route('/admin_portal/add_subject/<int:course_id>', methods=['GET', 'POST'])
+@login_required
+def add_subject(course_id):
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+    
+    course = db.session.get(Course, course_id)
+    if course is None:
+        flash("Course not found.", 'danger')
+        return redirect(url_for('admin.view_courses'))
+    
+    if request.method == 'POST':
+        subject_name = request.form.get('subject_name')
+        new_subject = Subject(name=subject_name, course_id=course.id)
+        db.session.add(new_subject)
+        db.session.commit()
+        log_action(current_user, 'add_subject', f"Added subject '{subject_name}' to course '{course.name}'.")
+        flash(f"Subject '{subject_name}' added to {course.name} successfully.", 'success')
+        return redirect(url_for('admin.view_courses'))
+        
+    return render_template('add_subject.html', course=course)
+
+@bp.route('/admin_portal/edit_subject/<int:subject_id>', methods=['GET', 'POST'])
+@login_required
+def edit_subject(subject_id):
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+
+    subject = db.session.get(Subject, subject_id)
+    if subject is None:
+        flash("Subject not found.", 'danger')
+        return redirect(url_for('admin.view_courses'))
+    
+    if request.method == 'POST':
+        new_name = request.form.get('subject_name')
+        if new_name:
+            subject.name = new_name
+            db.session.commit()
+            log_action(current_user, 'edit_subject', f"Edited subject ID {subject_id} to '{new_name}'.")
+            flash("Subject updated successfully.", 'success')
+            return redirect(url_for('admin.view_courses'))
+        else:
+            flash("Subject name cannot be empty.", 'danger')
+
+    return render_template('edit_subject.html', subject=subject)
+
+@bp.route('/admin_portal/delete_subject/<int:subject_id>', methods=['POST'])
+@login_required
+def delete_subject(subject_id):
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+    
+    subject_to_delete = db.session.get(Subject, subject_id)
+    if subject_to_delete:
+        log_action(current_user, 'delete_subject', f"Deleted subject '{subject_to_delete.name}'.")
+        db.session.delete(subject_to_delete)
+        db.session.commit()
+        flash("Subject deleted successfully.", 'success')
+    else:
+        flash("Subject not found.", 'danger')
+        
+    return redirect(url_for('admin.view_courses'))
+
+
+@bp.route('/admin_portal/audit_logs')
+@login_required
+def audit_logs():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+    
+    user_filter = request.args.get('user_id', type=int)
+    action_filter = request.args.get('action', '').strip()
+    date_from = request.args.get('date_from', '')
+    date_to = request.args.get('date_to', '')
+    period = request.args.get('period', '')
+    cursor = request.args.get('cursor', '')
+
+    periods = archived_periods()
+    table = archive_table(period) if period in periods else AuditLog.__table__
+    if table is AuditLog.__table__:
+        period = ''
+
+    # The username/role come from the same statement, so rendering the page
+    # never lazy-loads log.user.
+    query = db.select(
+        table.c.id, table.c.timestamp, table.c.action, table.c.details, User.username, User.role
+    ).outerjoin(User, User.id == table.c.user_id)
+
+    if user_filter:
+        query = query.where(table.c.user_id == user_filter)
+    if action_filter:
+        query = query.where(table.c.action == action_filter)
+    try:
+        if date_from:
+            query = query.where(table.c.timestamp >= datetime.strptime(date_from, '%Y-%m-%d'))
+        if date_to:
+            query = query.where(table.c.timestamp < datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1))
+        if cursor:
+            cursor_timestamp, cursor_id = cursor.rsplit('_', 1)
+            query = query.where(db.tuple_(table.c.timestamp, table.c.id) < (datetime.fromisoformat(cursor_timestamp), int(cursor_id)))
+    except ValueError:
+        flash("Invalid filter value.", 'danger')
+        return redirect(url_for('admin.audit_logs'))
+
+    logs = db.session.execute(
+        query.order_by(table.c.timestamp.desc(), table.c.id.desc()).limit(AUDIT_LOG_PAGE_SIZE + 1)
+    ).all()
+    next_cursor = None
+    if len(logs) > AUDIT_LOG_PAGE_SIZE:
+        logs = logs[:AUDIT_LOG_PAGE_SIZE]
+        next_cursor = f"{logs[-1].timestamp.isoformat()}_{logs[-1].id}"
+
+    users = User.query.order_by(User.username).all()
+    return render_template(
+        'audit_logs.html',
+        logs=logs,
+        users=users,
+        periods=periods,
+        period=period,
+        user_filter=user_filter,
+        action_filter=action_filter,
+        date_from=date_from,
+        date_to=date_to,
+        next_cursor=next_cursor
+    )
+
+@bp.route('/admin_portal/manage_appointments')
+@login_required
+def manage_appointments():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+    
+    try:
+        start = parse_date(request.args.get('start')) or date.today()
+    except ValueError:
+        start = date.today()
+    days = min(max(request.args.get('days', scheduling.CALENDAR_DAYS, type=int), 1), scheduling.CALENDAR_MAX_DAYS)
+    staff_id = request.args.get('staff_id', type=int)
+    calendar = scheduling.StaffCalendar(start, start + timedelta(days=days - 1), [staff_id] if staff_id else None)
+
+    return render_template(
+        'manage_appointments.html',
+        calendar_days=calendar.by_day(),
+        staff_members=Staff.query.order_by(Staff.name).all(),
+        staff_id=staff_id,
+        start=start,
+        end=calendar.date_to,
+        days=days,
+        previous_start=start - timedelta(days=days),
+        next_start=start + timedelta(days=days)
+    )
+
+@bp.route('/admin_portal/profiling', methods=['GET', 'POST'])
+@login_required
+def profiling():
+    if current_user.role != 'admin':
+        return redirect(url_for('auth.login'))
+
+    if request.method == 'POST':
+        request_profiler.reset()
+        flash("Profiling statistics cleared.", 'success')
+        return redirect(url_for('admin.profiling'))
+
+    routes = request_profiler.routes()
+    return render_template(
+        'profiling.html',
+        enabled=current_app.config.get('PROFILING_ENABLED', False),
+        routes=routes,
+        buckets=HISTOGRAM_BUCKETS_MS,
+        threshold=request_profiler.repeat_threshold
+    )
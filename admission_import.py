@@ -0,0 +1,181 @@
+import csv
+import io
+from datetime import date
+
+from models import db, Enquiry, Student, Fee, Installment, Payment
+from catalog import catalog
+from admissions import discounted
+import rollups
+import enquiry_queue
+import installments
+
+# --- Bulk Admission Import ---
+# Validates a CSV of admissions and inserts the Enquiry/Student/Fee/
+# Installment/Payment rows with one executemany per table inside the
+# caller's transaction. Ids are allocated up front so the rows can reference
+# each other without a flush per admission; a concurrent writer makes the
+# insert fail rather than collide, and the caller rolls the whole batch back.
+# total_fees is billed after the global discount, as admissions.admit() does.
+
+CSV_COLUMNS = [
+    'student_name', 'father_name', 'qualification', 'contact_no', 'father_contact_no', 'dob',
+    'full_address', 'exam_type', 'target_exam', 'course_name', 'date_of_admission', 'total_fees',
+    'payment_plan', 'num_installments', 'first_payment_amount', 'payment_date',
+]
+REQUIRED_COLUMNS = ['student_name', 'contact_no', 'course_name', 'total_fees', 'payment_plan']
+PAYMENT_PLANS = ('full_payment', 'installments')
+
+def _parse_date(value, field):
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        raise ValueError(f"{field} must be a YYYY-MM-DD date")
+
+def _parse_amount(value, field):
+    try:
+        amount = float(value) if value else 0.0
+    except ValueError:
+        raise ValueError(f"{field} must be a number")
+    if amount < 0:
+        raise ValueError(f"{field} cannot be negative")
+    return amount
+
+def _validate_row(raw, course_names):
+    row = {column: (raw.get(column) or '').strip() for column in CSV_COLUMNS}
+    missing = [column for column in REQUIRED_COLUMNS if not row[column]]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    if row['course_name'] not in course_names:
+        raise ValueError(f"unknown course '{row['course_name']}'")
+    if row['payment_plan'] not in PAYMENT_PLANS:
+        raise ValueError(f"payment_plan must be one of {', '.join(PAYMENT_PLANS)}")
+
+    row['date_of_admission'] = _parse_date(row['date_of_admission'], 'date_of_admission')
+    row['payment_date'] = _parse_date(row['payment_date'], 'payment_date')
+    row['total_fees'] = discounted(_parse_amount(row['total_fees'], 'total_fees'))
+    row['first_payment_amount'] = _parse_amount(row['first_payment_amount'], 'first_payment_amount')
+    if row['total_fees'] <= 0:
+        raise ValueError("total_fees must be greater than zero")
+    if row['first_payment_amount'] > row['total_fees']:
+        raise ValueError(f"first_payment_amount cannot exceed total_fees ({row['total_fees']:,.2f} billed)")
+    if row['num_installments']:
+        if not row['num_installments'].isdigit() or int(row['num_installments']) < 1:
+            raise ValueError("num_installments must be a positive whole number")
+        row['num_installments'] = int(row['num_installments'])
+    else:
+        row['num_installments'] = None
+    if row['payment_plan'] == 'installments' and row['num_installments'] is None:
+        raise ValueError("num_installments is required for installment plans")
+    return row
+
+def parse_admissions(text):
+    """
+    Parses and validates CSV text. Returns (rows, errors) where errors is a
+    list of (line number, message) tuples.
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    missing_columns = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing_columns:
+        return [], [(1, f"Missing required column(s): {', '.join(missing_columns)}")]
+
+    course_names = {course.name for course in catalog.courses()}
+    rows, errors = [], []
+    for line, raw in enumerate(reader, start=2):
+        try:
+            rows.append(_validate_row(raw, course_names))
+        except ValueError as error:
+            errors.append((line, str(error)))
+    return rows, errors
+
+def _next_id(model):
+    return (db.session.query(db.func.max(model.id)).scalar() or 0) + 1
+
+def import_admissions(rows):
+    """
+    Inserts validated rows in the current transaction. Returns the number
+    of students admitted and payments recorded. The caller commits.
+    """
+    enquiry_id, student_id, fee_id, payment_id = (_next_id(model) for model in (Enquiry, Student, Fee, Payment))
+    enquiries, students, fees, payments, schedules = [], [], [], [], []
+
+    for offset, row in enumerate(rows):
+        admitted_on = row['date_of_admission'] or date.today()
+        paid = row['first_payment_amount']
+        paid_on = row['payment_date'] or admitted_on
+        if paid >= row['total_fees']:
+            status = 'paid'
+        elif paid > 0:
+            status = 'partially_paid'
+        else:
+            status = 'pending'
+
+        enquiries.append({
+            'id': enquiry_id + offset,
+            'name': row['student_name'],
+            'contact': row['contact_no'],
+            'course_interest': row['course_name'],
+            'status': 'Admitted',
+            'joining_date': admitted_on,
+        })
+        students.append({
+            'id': student_id + offset,
+            'name': row['student_name'],
+            'father_name': row['father_name'] or None,
+            'qualification': row['qualification'] or None,
+            'contact_no': row['contact_no'],
+            'father_contact_no': row['father_contact_no'] or None,
+            'dob': row['dob'] or None,
+            'full_address': row['full_address'] or None,
+            'exam_type': row['exam_type'] or None,
+            'target_exam': row['target_exam'] or None,
+            'date_of_admission': admitted_on,
+            'enquiry_id': enquiry_id + offset,
+        })
+        fees.append({
+            'id': fee_id + offset,
+            'student_id': student_id + offset,
+            'total_amount': row['total_fees'],
+            'payment_plan': row['payment_plan'],
+            'num_installments': row['num_installments'],
+            'status': status,
+            'amount_paid': paid,
+            'pending_amount': row['total_fees'] - paid,
+            'last_paid_date': paid_on if paid > 0 else None,
+        })
+        schedules.append({
+            'id': fee_id + offset,
+            'total_amount': row['total_fees'],
+            'payment_plan': row['payment_plan'],
+            'num_installments': row['num_installments'],
+            'amount_paid': paid,
+            'start': admitted_on,
+        })
+        if paid > 0:
+            payments.append({
+                'id': payment_id + len(payments),
+                'fee_id': fee_id + offset,
+                'amount': paid,
+                'payment_date': paid_on,
+                'notes': 'Imported',
+            })
+
+    installment_rows = installments.rows_for_fees(schedules)
+    today = date.today()
+    overdue_fee_ids = {row['fee_id'] for row in installment_rows if row['state'] != 'paid' and row['due_date'] < today}
+    for fee in fees:
+        if fee['id'] in overdue_fee_ids and fee['status'] != 'paid':
+            fee['status'] = 'overdue'
+    for model, batch in ((Enquiry, enquiries), (Student, students), (Fee, fees), (Installment, installment_rows),
+                         (Payment, payments)):
+        if batch:
+            db.session.execute(db.insert(model), batch)
+
+    # Core inserts bypass the ORM flush hooks, so fold the batch into the
+    # revenue rollups and enquiry status counts explicitly.
+    connection = db.session.connection()
+    enquiry_queue.apply_status_deltas(connection, {'Admitted': len(enquiries)})
+    if fees:
+        rollups.apply_fees(connection, [fee['id'] for fee in fees])
+    if payments:
+        rollups.apply_payments(connection, [payment['id'] for payment in payments])
+    return len(students), len(payments)
@@ -0,0 +1,82 @@
+from datetime import date
+
+from models import db, Enquiry, Student, Fee
+from settings import settings
+
+# --- Admission Service ---
+# Both admission routes build the same Enquiry -> Student -> Fee -> Payment
+# graph. admit() wires it up through relationships so the single flush in
+# commit() assigns every id and foreign key, and the fee status is derived
+# in memory by Fee.add_payment. Any failure rolls the whole admission back.
+# The institution's global discount is applied to the total fees entered,
+# and the first payment may not exceed the discounted total.
+
+STUDENT_FIELDS = [
+    'father_name', 'qualification', 'father_contact_no', 'dob', 'full_address', 'exam_type', 'target_exam',
+]
+
+def _amount(value, field):
+    try:
+        amount = float(value) if value else 0.0
+    except ValueError:
+        raise ValueError(f"{field} must be a number.")
+    if amount < 0:
+        raise ValueError(f"{field} cannot be negative.")
+    return amount
+
+def discount_percentage():
+    return settings.get('global_discount_percentage')
+
+def discounted(total_fees):
+    """The total billed after the global discount."""
+    discount = discount_percentage()
+    return round(total_fees * (100 - discount) / 100, 2) if discount else total_fees
+
+def admit(form, date_of_admission, enquiry=None, payment_date=None):
+    """
+    Admits a student from the admission form fields. Uses the given enquiry
+    or creates an 'Admitted' one for a walk-in. Returns the new Student.
+    Raises ValueError for invalid amounts before anything is written.
+    """
+    total_fees = discounted(_amount(form.get('total_fees'), 'Total fees'))
+    first_payment = _amount(form.get('first_payment_amount'), 'First payment amount')
+    if first_payment > total_fees:
+        raise ValueError(f"First payment amount cannot be more than the total fees billed ({total_fees:,.2f}).")
+    num_installments = form.get('num_installments')
+    if num_installments and not num_installments.isdigit():
+        raise ValueError("Number of installments must be a whole number.")
+
+    try:
+        if enquiry is None:
+            enquiry = Enquiry(
+                name=form.get('student_name'),
+                contact=form.get('contact_no'),
+                course_interest=form.get('course_name'),
+                joining_date=date_of_admission
+            )
+            db.session.add(enquiry)
+        enquiry.status = 'Admitted'
+
+        student = Student(
+            name=form.get('student_name'),
+            contact_no=form.get('contact_no'),
+            date_of_admission=date_of_admission,
+            enquiry=enquiry,
+            **{field: form.get(field) for field in STUDENT_FIELDS}
+        )
+        fee = Fee(
+            student=student,
+            total_amount=total_fees,
+            payment_plan=form.get('payment_plan'),
+            num_installments=int(num_installments) if num_installments else None,
+            status='pending'
+        )
+        db.session.add_all([student, fee])
+        if first_payment > 0:
+            fee.add_payment(first_payment, payment_date or date.today())
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return student
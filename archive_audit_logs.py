@@ -0,0 +1,29 @@
+from database import create_db_app
+from audit import archive_before
+from migrations import upgrade_database
+from datetime import datetime
+import sys
+
+def archive_audit_logs(keep_months=3):
+    """
+    Moves audit log rows older than the start of the month keep_months
+    months ago into monthly archive tables. Intended to run monthly.
+    """
+    app = create_db_app()
+    with app.app_context():
+        upgrade_database()
+
+        today = datetime.now()
+        month_index = today.year * 12 + today.month - 1 - keep_months
+        cutoff = datetime(month_index // 12, month_index % 12 + 1, 1)
+
+        moved = archive_before(cutoff)
+        if not moved:
+            print(f"No audit logs older than {cutoff:%Y-%m-%d} to archive.")
+        for period, count in sorted(moved.items()):
+            print(f"Archived {count} audit log(s) for {period.replace('_', '-')}.")
+
+if __name__ == '__main__':
+    # Usage: python archive_audit_logs.py [months_to_keep]
+    keep_months = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    archive_audit_logs(keep_months)
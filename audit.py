@@ -0,0 +1,191 @@
+import atexit
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+
+from models import db, AuditLog
+
+# --- Audit Log Writer ---
+# Audit entries are queued in process memory and written by a background
+# thread in bulk INSERTs, so request handlers never wait on the audit commit.
+# With AUDIT_LOG_ASYNC disabled every entry is committed immediately, which
+# is what tests and one-off scripts want.
+
+_STOP = object()
+
+class AuditWriter:
+    def __init__(self):
+        self.app = None
+        self.batch_size = 100
+        self.flush_interval = 0.5
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        # Re-initialising (another create_app() call) must not strand queued entries.
+        self.flush()
+        self.app = app
+        self.batch_size = app.config.get('AUDIT_LOG_BATCH_SIZE', 100)
+        self.flush_interval = app.config.get('AUDIT_LOG_FLUSH_INTERVAL_MS', 500) / 1000.0
+        self._queue = queue.Queue(maxsize=app.config.get('AUDIT_LOG_QUEUE_SIZE', 10000))
+        atexit.unregister(self.shutdown)
+        atexit.register(self.shutdown)
+
+    def log(self, user, action, details):
+        entry = {
+            'user_id': user.id,
+            'action': action,
+            'details': details,
+            'timestamp': datetime.now(),
+        }
+        if not self.app.config.get('AUDIT_LOG_ASYNC', True):
+            self._write_now(entry)
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Never drop an audit record; pay for the commit instead.
+            self._write_now(entry)
+
+    def flush(self):
+        """Blocks until every queued entry has been written."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def shutdown(self):
+        """Drains the queue and stops the writer thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _ensure_started(self):
+        # Pre-fork servers copy the parent's state without its threads, so
+        # each worker process starts its own writer on first use.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    entry = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(entry)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch:
+                try:
+                    self._write(batch)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+
+    def _write_now(self, entry):
+        db.session.add(AuditLog(**entry))
+        db.session.commit()
+
+    def _write(self, entries):
+        with self.app.app_context():
+            try:
+                db.session.execute(db.insert(AuditLog), entries)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception("Failed to write %d audit log entries.", len(entries))
+            else:
+                for entry in entries:
+                    self.app.logger.info("AUDIT: user %s performed '%s' - %s", entry['user_id'], entry['action'], entry['details'])
+
+audit_writer = AuditWriter()
+
+
+# --- Audit Log Archive ---
+# Rows older than the retention window are moved out of audit_log into one
+# table per calendar month (audit_log_archive_YYYY_MM) with the same columns,
+# keeping the live table small while the history stays queryable.
+
+ARCHIVE_PREFIX = 'audit_log_archive_'
+_archive_metadata = db.MetaData()
+
+def archive_table(period):
+    """Returns the archive Table for a 'YYYY_MM' period."""
+    if not re.fullmatch(r'\d{4}_\d{2}', period):
+        raise ValueError(f"Invalid archive period '{period}'.")
+    name = ARCHIVE_PREFIX + period
+    if name in _archive_metadata.tables:
+        return _archive_metadata.tables[name]
+    return db.Table(
+        name,
+        _archive_metadata,
+        db.Column('id', db.Integer, primary_key=True),
+        db.Column('user_id', db.Integer, nullable=False),
+        db.Column('action', db.String(200), nullable=False),
+        db.Column('details', db.String(500), nullable=True),
+        db.Column('timestamp', db.DateTime, nullable=False),
+        db.Index(f'ix_{name}_timestamp_id', 'timestamp', 'id'),
+        db.Index(f'ix_{name}_user_id_timestamp', 'user_id', 'timestamp', 'id'),
+        db.Index(f'ix_{name}_action_timestamp', 'action', 'timestamp', 'id'),
+    )
+
+def archived_periods():
+    """Lists archived 'YYYY_MM' periods, newest first."""
+    names = db.inspect(db.engine).get_table_names()
+    return sorted((name[len(ARCHIVE_PREFIX):] for name in names if name.startswith(ARCHIVE_PREFIX)), reverse=True)
+
+def archive_before(cutoff):
+    """
+    Moves every audit_log row with a timestamp before cutoff into its
+    monthly archive table, one transaction per month. Returns a dict of
+    period -> rows moved.
+    """
+    live = AuditLog.__table__
+    moved = {}
+    while True:
+        oldest = db.session.query(db.func.min(AuditLog.timestamp)).filter(AuditLog.timestamp < cutoff).scalar()
+        if oldest is None:
+            break
+
+        start = datetime(oldest.year, oldest.month, 1)
+        end = datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+        end = min(end, cutoff)
+        period = start.strftime('%Y_%m')
+        table = archive_table(period)
+        table.create(db.engine, checkfirst=True)
+
+        in_period = db.and_(live.c.timestamp >= start, live.c.timestamp < end)
+        columns = [live.c.id, live.c.user_id, live.c.action, live.c.details, live.c.timestamp]
+        db.session.execute(
+            table.insert().from_select([column.name for column in columns], db.select(*columns).where(in_period))
+        )
+        result = db.session.execute(live.delete().where(in_period))
+        db.session.commit()
+        moved[period] = moved.get(period, 0) + result.rowcount
+    return moved
@@ -0,0 +1,62 @@
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask_login import LoginManager, login_user, login_required, logout_user, current_user
+from models import db, User
+from user_cache import user_cache
+from passwords import HashingOverloaded
+from view_helpers import log_action
+
+# --- Login and Logout ---
+bp = Blueprint('auth', __name__)
+
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login'
+
+# --- User Loader for Flask-Login ---
+@login_manager.user_loader
+def load_user(user_id):
+    # Deactivated users are logged out on their next request.
+    user = user_cache.get(int(user_id))
+    return user if user is not None and user.is_active else None
+
+@bp.route('/')
+def home():
+    return redirect(url_for('auth.login'))
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+
+        user = User.query.filter_by(username=username).first()
+        try:
+            authenticated = user is not None and user.is_active and user.check_password(password)
+            if authenticated and user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
+        except HashingOverloaded:
+            flash("The server is busy. Please try logging in again in a moment.", 'warning')
+            return render_template('login.html'), 503
+
+        if authenticated:
+            login_user(user)
+            log_action(user, 'login', f"Successful login.")
+            if user.role == 'admin':
+                return redirect(url_for('admin.admin_portal'))
+            elif user.role == 'staff':
+                return redirect(url_for('staff.staff_portal'))
+            elif user.role == 'receptionist':
+                return redirect(url_for('receptionist.receptionist_portal'))
+        
+        flash("Login failed. Please try again.", 'danger')
+        return redirect(url_for('auth.login'))
+
+    return render_template('login.html')
+
+
+@bp.route('/logout')
+@login_required
+def logout():
+    log_action(current_user, 'logout', 'Successful logout.')
+    logout_user()
+    return redirect(url_for('auth.login'))
@@ -0,0 +1,107 @@
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+# Point the app at a throwaway on-disk database so commits pay for real syncs.
+DB_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(DB_DIR, 'benchmark_admissions.db')
+
+from sqlalchemy import event
+
+from app import create_app, create_initial_data
+from models import db, Enquiry, Student, Course, Fee
+import admissions
+
+# --- Admission Write Benchmark ---
+# Times direct admissions through the old commit-per-entity flow and the
+# single-transaction admission service. Every commit is a durability point
+# where SQLite syncs the journal and database file to disk, so the commit
+# count is the fsync count to compare.
+#
+# Usage: python benchmark_admissions.py [admissions_per_flow]
+
+def form(i):
+    return {
+        'student_name': f'Benchmark Student {i}',
+        'contact_no': f'97{i:08d}',
+        'course_name': 'JEE',
+        'total_fees': '12000',
+        'payment_plan': 'installments',
+        'num_installments': '3',
+        'first_payment_amount': '4000',
+    }
+
+def legacy_admission(data, date_of_admission):
+    """The previous direct_admission flow: one commit per entity."""
+    enquiry = Enquiry(name=data['student_name'], contact=data['contact_no'], course_interest=data['course_name'],
+                      status='Admitted', joining_date=date_of_admission)
+    db.session.add(enquiry)
+    db.session.commit()
+
+    student = Student(name=data['student_name'], contact_no=data['contact_no'],
+                      date_of_admission=date_of_admission, enquiry_id=enquiry.id)
+    db.session.add(student)
+    db.session.commit()
+
+    fee = Fee(student_id=student.id, total_amount=float(data['total_fees']), payment_plan=data['payment_plan'],
+              num_installments=int(data['num_installments']), status='pending')
+    db.session.add(fee)
+    db.session.commit()
+
+    fee.add_payment(float(data['first_payment_amount']), date.today())
+    db.session.commit()
+
+def service_admission(data, date_of_admission):
+    admissions.admit(data, date_of_admission)
+
+def run(name, admit, count, offset):
+    commits = []
+    statements = []
+    on_commit = lambda connection: commits.append(1)
+    on_execute = lambda *args: statements.append(1)
+    event.listen(db.engine, 'commit', on_commit)
+    event.listen(db.engine, 'before_cursor_execute', on_execute)
+
+    timings = []
+    try:
+        for i in range(offset, offset + count):
+            started = time.perf_counter()
+            admit(form(i), date.today())
+            timings.append((time.perf_counter() - started) * 1000)
+            db.session.remove()
+    finally:
+        event.remove(db.engine, 'commit', on_commit)
+        event.remove(db.engine, 'before_cursor_execute', on_execute)
+
+    timings.sort()
+    return {
+        'flow': name,
+        'p50': statistics.median(timings),
+        'p95': timings[int(len(timings) * 0.95) - 1],
+        'commits': len(commits) / count,
+        'statements': len(statements) / count,
+    }
+
+def main(count):
+    app = create_app()
+    create_initial_data(app)
+    with app.app_context():
+        db.session.add(Course(name='JEE'))
+        db.session.commit()
+
+        results = [
+            run('before (commit per entity)', legacy_admission, count, 0),
+            run('after (admission service)', service_admission, count, count),
+        ]
+
+    print(f"{count} admissions per flow\n")
+    print(f"{'Flow':<28}{'p50 ms':>10}{'p95 ms':>10}{'Commits':>10}{'SQL':>8}")
+    for result in results:
+        print(f"{result['flow']:<28}{result['p50']:>10.2f}{result['p95']:>10.2f}"
+              f"{result['commits']:>10.1f}{result['statements']:>8.1f}")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,109 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# --- Concurrent Writer Benchmark ---
+# Drives the real routes from several threads at once: receptionists record
+# payments while admins load the dashboard and fees page. Reports request
+# throughput and how many requests failed with "database is locked", once
+# per engine profile so the default settings can be compared with WAL.
+#
+# Usage: python benchmark_concurrency.py [writers] [readers] [seconds]
+#        python benchmark_concurrency.py --profile production [writers] [readers] [seconds]
+
+PROFILES = ['default', 'production']
+
+def run_profile(profile, writers, readers, seconds):
+    # Point the app at a throwaway database before it is imported.
+    db_dir = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(db_dir, 'benchmark_concurrency.db')
+    os.environ['DATABASE_PROFILE'] = profile
+
+    from sqlalchemy.exc import OperationalError
+
+    from app import create_app, create_initial_data
+    from models import db, User, Receptionist, Course
+    import admissions
+
+    app = create_app({'TESTING': True})
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_initial_data(app)
+    with app.app_context():
+        receptionist_user = User.query.filter_by(username='receptionist_user').first()
+        db.session.add_all([Receptionist(name='Front Desk', user_id=receptionist_user.id), Course(name='JEE')])
+        db.session.commit()
+        student_ids = [
+            admissions.admit({
+                'student_name': f'Student {i}', 'contact_no': f'98{i:08d}', 'course_name': 'JEE',
+                'total_fees': '1000000', 'payment_plan': 'installments', 'num_installments': '12',
+                'first_payment_amount': '0',
+            }, None).id
+            for i in range(50)
+        ]
+
+    counts = {'write': 0, 'read': 0, 'locked': 0, 'failed': 0}
+    lock = threading.Lock()
+    window = {}
+
+    def start_clock():
+        window['started'] = time.monotonic()
+        window['deadline'] = window['started'] + seconds
+
+    def worker(index, username, password, writer):
+        client = app.test_client()
+        client.post('/login', data={'username': username, 'password': password})
+        ready.wait()  # start timing once every client has logged in
+        n = 0
+        while time.monotonic() < window['deadline']:
+            n += 1
+            try:
+                if writer:
+                    student_id = student_ids[(index * 7 + n) % len(student_ids)]
+                    response = client.post(f'/receptionist_portal/record_payment/{student_id}',
+                                           data={'payment_amount': '10'})
+                else:
+                    response = client.get('/admin_portal' if username == 'admin_user' else '/receptionist_portal/fees_management')
+                outcome = ('write' if writer else 'read') if response.status_code < 500 else 'failed'
+            except OperationalError as error:
+                outcome = 'locked' if 'locked' in str(error) else 'failed'
+            except Exception:
+                outcome = 'failed'
+            with lock:
+                counts[outcome] += 1
+
+    # fees_management is a receptionist page and the dashboard an admin one.
+    roles = [('receptionist_user', 'receptionist_password', True)] * writers
+    roles += [('admin_user', 'admin_password', False), ('receptionist_user', 'receptionist_password', False)] * (readers // 2)
+    roles += [('admin_user', 'admin_password', False)] * (readers % 2)
+    ready = threading.Barrier(len(roles), action=start_clock)
+    threads = [threading.Thread(target=worker, args=(i, *role)) for i, role in enumerate(roles)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - window['started']
+
+    print(f"{profile:<12}{counts['write'] / elapsed:>12.1f}{counts['read'] / elapsed:>12.1f}"
+          f"{counts['locked']:>10}{counts['failed']:>10}")
+
+def main(args):
+    writers, readers, seconds = (int(args[i]) if len(args) > i else default for i, default in enumerate((4, 4, 10)))
+    print(f"{writers} writer and {readers} reader threads for {seconds}s each\n")
+    print(f"{'Profile':<12}{'Writes/s':>12}{'Reads/s':>12}{'Locked':>10}{'Failed':>10}")
+    # Each profile runs in a fresh interpreter because config.Config reads
+    # DATABASE_PROFILE from the environment when it is imported.
+    for profile in PROFILES:
+        subprocess.run([sys.executable, __file__, '--profile', profile, *map(str, (writers, readers, seconds))],
+                       check=True)
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--profile']:
+        writers, readers, seconds = (int(value) for value in sys.argv[3:6])
+        run_profile(sys.argv[2], writers, readers, seconds)
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,84 @@
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# Point the app at a throwaway database before it is imported.
+DB_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(DB_DIR, 'benchmark_logins.db')
+
+# --- Login Storm Benchmark ---
+# Starts a burst of simultaneous logins through the real /login route while
+# a probe thread keeps loading the login page, which needs no hashing. It
+# reports login latency, how many logins were turned away as overloaded,
+# and whether cheap pages stayed responsive during the storm.
+#
+# Usage: python benchmark_logins.py [concurrent_logins] [bcrypt_rounds]
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+def main(logins, rounds):
+    os.environ['BCRYPT_LOG_ROUNDS'] = str(rounds)
+    from app import create_app, create_initial_data
+    from models import password_hasher
+
+    app = create_app({'TESTING': True})
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_initial_data(app)
+
+    login_times, probe_times = [], []
+    outcomes = {'ok': 0, 'busy': 0, 'failed': 0}
+    lock = threading.Lock()
+    start = threading.Barrier(logins + 1)
+    storm_over = threading.Event()
+
+    def log_in():
+        client = app.test_client()
+        start.wait()
+        started = time.perf_counter()
+        response = client.post('/login', data={'username': 'receptionist_user', 'password': 'receptionist_password'})
+        elapsed = (time.perf_counter() - started) * 1000
+        outcome = 'ok' if response.status_code == 302 and '/login' not in response.location else (
+            'busy' if response.status_code == 503 else 'failed')
+        with lock:
+            login_times.append(elapsed)
+            outcomes[outcome] += 1
+
+    def probe():
+        client = app.test_client()
+        start.wait()
+        while not storm_over.is_set():
+            started = time.perf_counter()
+            client.get('/login')
+            probe_times.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=log_in) for _ in range(logins)]
+    prober = threading.Thread(target=probe)
+    prober.start()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    storm_over.set()
+    prober.join()
+
+    print(f"{logins} simultaneous logins at bcrypt cost {rounds}, "
+          f"{password_hasher.workers} hashing workers, queue limit {password_hasher.queue_limit}\n")
+    print(f"Storm finished in {elapsed:.2f}s")
+    print(f"Logins     ok {outcomes['ok']}  busy (503) {outcomes['busy']}  failed {outcomes['failed']}")
+    print(f"Login ms   p50 {statistics.median(login_times):.1f}  p99 {percentile(login_times, 0.99):.1f}")
+    print(f"Page ms    p50 {statistics.median(probe_times or [0.0]):.1f}  p99 {percentile(probe_times, 0.99):.1f}"
+          f"  ({len(probe_times)} requests to /login during the storm)")
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 12)
@@ -0,0 +1,180 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from app import create_app
+from models import db, User, Staff, Enquiry, Student, Fee, Course, Subject
+from profiling import percentile
+
+# --- Route Benchmark ---
+# Logs in as each role through the test client and times every page of
+# the app against the database in DATABASE_URL, normally one filled by
+# seed_data.py. Each route gets a few warm-up requests and then a fixed
+# number of timed ones; throughput, p50/p99/max latency and status codes
+# are printed and saved as JSON together with the table sizes and the git
+# commit, so runs can be compared with --compare. Only GET requests are
+# made, so the data is left as it was (apart from login audit entries).
+#
+# Usage: python benchmark_routes.py [--requests 50] [--warmup 3] [--role admin] [--match fees]
+#                                   [--output results.json] [--compare previous.json]
+
+CREDENTIALS = {
+    'admin': ('admin_user', 'admin_password'),
+    'staff': ('staff_user', 'staff_password'),
+    'receptionist': ('receptionist_user', 'receptionist_password'),
+}
+
+# URLs are formatted with the ids and dates from sample_values().
+ROUTES = [
+    ('admin', '/admin_portal'),
+    ('admin', '/admin_portal/manage_users'),
+    ('admin', '/admin_portal/edit_user/{user_id}'),
+    ('admin', '/admin_portal/manage_students'),
+    ('admin', '/admin_portal/edit_student/{student_id}'),
+    ('admin', '/admin_portal/financial_reports'),
+    ('admin', '/admin_portal/financial_reports?granularity=day&date_from={month_ago}&date_to={today}'),
+    ('admin', '/admin_portal/institutional_settings'),
+    ('admin', '/admin_portal/courses'),
+    ('admin', '/admin_portal/edit_course/{course_id}'),
+    ('admin', '/admin_portal/edit_subject/{subject_id}'),
+    ('admin', '/admin_portal/audit_logs'),
+    ('admin', '/admin_portal/audit_logs?action=login&date_from={month_ago}&date_to={today}'),
+    ('admin', '/admin_portal/manage_appointments'),
+    ('admin', '/admin_portal/manage_appointments?start={today}&days=31&staff_id={staff_id}'),
+    ('staff', '/staff_portal'),
+    ('receptionist', '/receptionist_portal'),
+    ('receptionist', '/receptionist_portal?status=Admitted'),
+    ('receptionist', '/receptionist_portal?q=Sharma'),
+    ('receptionist', '/receptionist_portal/add_enquiry'),
+    ('receptionist', '/receptionist_portal/admit_student/{enquiry_id}'),
+    ('receptionist', '/receptionist_portal/direct_admission'),
+    ('receptionist', '/receptionist_portal/schedule_appointment?staff_id={staff_id}'),
+    ('receptionist', '/receptionist_portal/free_slots?staff_id={staff_id}&after={today}T09:00'),
+    ('receptionist', '/receptionist_portal/fees_management'),
+    ('receptionist', '/receptionist_portal/fees_management?status=overdue'),
+    ('receptionist', '/receptionist_portal/collections'),
+    ('receptionist', '/receptionist_portal/collections?view=overdue'),
+    ('receptionist', '/receptionist_portal/record_payment/{fee_student_id}'),
+    ('receptionist', '/receptionist_portal/student_profile'),
+    ('receptionist', '/receptionist_portal/student_profile/{student_id}'),
+]
+
+TABLES = ['user', 'enquiry', 'student', 'fee', 'installment', 'payment', 'appointment', 'audit_log']
+
+def sample_values():
+    """Ids that exist in the database, taken from the newest rows, and dates around today."""
+    def newest(column, *criteria):
+        return db.session.query(db.func.max(column)).filter(*criteria).scalar() or 1
+    today = date.today()
+    return {
+        'user_id': newest(User.id, User.role == 'staff'),
+        'staff_id': newest(Staff.id),
+        'student_id': newest(Student.id),
+        'fee_student_id': newest(Fee.student_id),
+        'enquiry_id': newest(Enquiry.id, Enquiry.status == 'New'),
+        'course_id': newest(Course.id),
+        'subject_id': newest(Subject.id),
+        'today': today.isoformat(),
+        'month_ago': (today - timedelta(days=30)).isoformat(),
+    }
+
+def table_sizes():
+    return {table: db.session.execute(db.text(f'SELECT count(*) FROM "{table}"')).scalar() for table in TABLES}
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def time_route(client, url, warmup, requests):
+    for _ in range(warmup):
+        client.get(url)
+    latencies, statuses = [], Counter()
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        response = client.get(url)
+        latencies.append((time.perf_counter() - request_started) * 1000)
+        statuses[response.status_code] += 1
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': requests,
+        'throughput': requests / elapsed,
+        'p50_ms': percentile(latencies, 0.5),
+        'p99_ms': percentile(latencies, 0.99),
+        'max_ms': max(latencies),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+def compare(results, baseline_path):
+    with open(baseline_path) as baseline_file:
+        baseline = {(route['role'], route['url']): route for route in json.load(baseline_file)['routes']}
+    print(f"\nCompared with {baseline_path} (p50 and p99 change, negative is faster):")
+    for route in results['routes']:
+        previous = baseline.get((route['role'], route['url']))
+        if previous is None:
+            continue
+        p50 = (route['p50_ms'] / previous['p50_ms'] - 1) * 100 if previous['p50_ms'] else 0.0
+        p99 = (route['p99_ms'] / previous['p99_ms'] - 1) * 100 if previous['p99_ms'] else 0.0
+        print(f"{route['role']:<14}{route['url'][:60]:<62}{p50:>+9.1f}%{p99:>+9.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every page of the app as each role.")
+    parser.add_argument('--requests', type=int, default=50, help="timed requests per route")
+    parser.add_argument('--warmup', type=int, default=3, help="untimed requests per route first")
+    parser.add_argument('--role', choices=sorted(CREDENTIALS), help="only this role's routes")
+    parser.add_argument('--match', help="only routes whose URL contains this text")
+    parser.add_argument('--output', help="JSON results file (default benchmark_routes_<time>.json)")
+    parser.add_argument('--compare', help="earlier JSON results to compare against")
+    args = parser.parse_args()
+
+    app = create_app({'TESTING': True})
+    with app.app_context():
+        values = sample_values()
+        sizes = table_sizes()
+
+    results = {
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'database': app.config['SQLALCHEMY_DATABASE_URI'],
+        'requests_per_route': args.requests,
+        'table_sizes': sizes,
+        'routes': [],
+    }
+    print(', '.join(f"{count} {table}" for table, count in sizes.items()))
+    print(f"\n{'Role':<14}{'URL':<62}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}  Status")
+
+    for role, (username, password) in CREDENTIALS.items():
+        routes = [url.format(**values) for route_role, url in ROUTES if route_role == role]
+        routes = [url for url in routes if args.match is None or args.match in url]
+        if (args.role and role != args.role) or not routes:
+            continue
+        client = app.test_client()
+        login = client.post('/login', data={'username': username, 'password': password})
+        if login.status_code != 302 or login.location.endswith('/login'):
+            sys.exit(f"Could not log in as {username}; seed the database with seed_data.py first.")
+        for url in routes:
+            result = dict(role=role, url=url, **time_route(client, url, args.warmup, args.requests))
+            results['routes'].append(result)
+            statuses = ' '.join(f"{count}x{status}" for status, count in result['statuses'].items())
+            print(f"{role:<14}{url[:60]:<62}{result['throughput']:>9.1f}{result['p50_ms']:>9.1f}"
+                  f"{result['p99_ms']:>9.1f}{result['max_ms']:>9.1f}  {statuses}")
+
+    output = args.output or f"benchmark_routes_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"\nResults saved to {output}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
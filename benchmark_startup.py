@@ -0,0 +1,93 @@
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+# --- Cold Start Benchmark ---
+# Starts fresh interpreters and measures how long each entry point takes
+# to become ready, its peak resident memory and how many modules it loads:
+#   cli - database.create_db_app(), what the maintenance scripts use
+#   web - create_app() plus one rendered page, i.e. a ready WSGI worker
+# With --baseline, the web probe is also run against an earlier commit
+# exported from git into a temporary directory, so a change can be given
+# a before/after figure. Trees from before the application factory have
+# no create_app; importing app.py builds their app, and every script had
+# to import it, so that one figure stands for both entry points.
+#
+# Usage: python benchmark_startup.py [--runs 5] [--baseline <commit>]
+
+PROBES = {
+    'cli': """
+from database import create_db_app
+from models import db
+app = create_db_app()
+with app.app_context():
+    db.session.execute(db.text('SELECT 1'))
+""",
+    'web': """
+import app as module
+if hasattr(module, 'create_app'):
+    app = module.create_app({'TESTING': True})
+else:
+    app = module.app
+    app.config['TESTING'] = True
+app.test_client().get('/login')
+""",
+}
+
+REPORT = """
+import json, resource, sys, time
+print(json.dumps({
+    'ready_ms': (time.perf_counter() - STARTED) * 1000,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': len(sys.modules),
+}))
+"""
+
+def measure(probe, env, cwd):
+    code = "import time\nSTARTED = time.perf_counter()\n" + PROBES[probe] + REPORT
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True,
+                            cwd=cwd).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - started) * 1000
+    return result
+
+def export_commit(commit):
+    """Extracts the tree of a commit into a temporary directory."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    archive = subprocess.run(['git', 'archive', '--format=tar', commit], capture_output=True, check=True, cwd=here).stdout
+    directory = tempfile.mkdtemp(prefix='benchmark_startup_')
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tree:
+        tree.extractall(directory, filter='data')
+    return directory
+
+def report(label, probe, env, cwd, runs):
+    results = [measure(probe, env, cwd) for _ in range(runs)]
+    median = {key: statistics.median(result[key] for result in results) for key in results[0]}
+    print(f"{label:<20}{median['process_ms']:>12.0f}{median['ready_ms']:>10.0f}"
+          f"{median['rss_mb']:>13.1f}{median['modules']:>9.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how long each entry point takes to start.")
+    parser.add_argument('--runs', type=int, default=5, help="interpreters started per entry point")
+    parser.add_argument('--baseline', help="earlier commit to run the web probe against as well")
+    args = parser.parse_args()
+
+    env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(tempfile.mkdtemp(), 'benchmark_startup.db'))
+    print(f"{'entry point':<20}{'process ms':>12}{'ready ms':>10}{'peak RSS MB':>13}{'modules':>9}"
+          f"   (median of {args.runs})")
+    for probe in PROBES:
+        report(probe, probe, env, os.path.dirname(os.path.abspath(__file__)), args.runs)
+    if args.baseline:
+        baseline_env = dict(env, DATABASE_URL='sqlite:///' + os.path.join(tempfile.mkdtemp(), 'benchmark_startup.db'))
+        report(f"web @ {args.baseline}"[:19], 'web', baseline_env, export_commit(args.baseline), args.runs)
+
+if __name__ == '__main__':
+    main()
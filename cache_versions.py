@@ -0,0 +1,95 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from models import db, CacheVersion
+
+# --- Cache Versions ---
+# The catalog, settings and logged-in user caches each keep rarely changing
+# rows in process memory, tagged with a named row of cache_version. A cache
+# registers the models it holds with track(); any flush that adds, changes
+# or deletes one of them bumps the row once per transaction, from any entry
+# point, and a commit in this process invalidates the local copy at once.
+# Other processes notice the change through a VersionCheck, which reads the
+# row at most every CACHE_VERSION_CHECK_SECONDS, so between checks a warm
+# cache costs no queries at all. The hooks are registered at import, so
+# scripts built on create_db_app() bump too.
+
+_tracked = []
+
+def current_version(connection, name):
+    return connection.execute(
+        db.select(CacheVersion.version).where(CacheVersion.name == name)
+    ).scalar() or 0
+
+def bump_version(connection, name):
+    statement = insert(CacheVersion.__table__).values(name=name, version=1)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=['name'], set_={'version': CacheVersion.__table__.c.version + 1}
+    ))
+
+class VersionCheck:
+    """
+    Throttled comparison of one cache_version row: moved() reads the row at
+    most once per interval and returns True when it differs from the
+    version the previous read saw (always on the first read). Call it
+    before loading, so a concurrent write can only leave newer data under
+    an older version, never the reverse.
+    """
+
+    def __init__(self, name, interval=5):
+        self.name = name
+        self.interval = interval
+        self._version = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def moved(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.interval:
+                return False
+            self._checked_at = now
+        version = current_version(db.session, self.name)
+        with self._lock:
+            moved, self._version = version != self._version, version
+        return moved
+
+def track(name, models, invalidate, ignore=()):
+    """
+    Bumps the name row whenever a flush adds, changes or deletes an instance
+    of models, and calls invalidate() once that transaction commits. A
+    change to an existing row that only touches attributes in ignore does
+    not count.
+    """
+    _tracked.append((name, tuple(models), frozenset(ignore), invalidate))
+
+def _changed(obj, ignore):
+    return any(attr.history.has_changes() for attr in db.inspect(obj).attrs if attr.key not in ignore)
+
+def _touched(session, models, ignore):
+    if any(isinstance(obj, models) for obj in (*session.new, *session.deleted)):
+        return True
+    return any(isinstance(obj, models) and _changed(obj, ignore) for obj in session.dirty)
+
+@event.listens_for(Session, 'after_flush')
+def _bump_versions(session, flush_context):
+    changed = session.info.setdefault('changed_cache_versions', set())
+    for name, models, ignore, _ in _tracked:
+        if name not in changed and _touched(session, models, ignore):
+            bump_version(session.connection(), name)
+            changed.add(name)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed(session):
+    changed = session.info.pop('changed_cache_versions', set())
+    for name, _, _, invalidate in _tracked:
+        if name in changed:
+            invalidate()
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('changed_cache_versions', None)
@@ -0,0 +1,69 @@
+import threading
+
+from models import db, Course, Subject
+from cache_versions import VersionCheck, track
+
+# --- Course Catalog Cache ---
+# Courses and their subjects change about once a term but fill the course
+# dropdown on most forms. The catalog is held in process memory as plain
+# read-only snapshots, tagged with the 'catalog' row of cache_version (see
+# cache_versions.py), which every write to a Course or Subject bumps. Other
+# processes notice the new version within CACHE_VERSION_CHECK_SECONDS;
+# between checks a cached render costs no queries at all.
+
+CATALOG_VERSION = 'catalog'
+
+class CatalogSubject:
+    def __init__(self, id, name, course_id):
+        self.id = id
+        self.name = name
+        self.course_id = course_id
+
+class CatalogCourse:
+    def __init__(self, id, name, subjects):
+        self.id = id
+        self.name = name
+        self.subjects = subjects
+
+class CatalogCache:
+    def __init__(self, check_interval=5):
+        self._check = VersionCheck(CATALOG_VERSION, check_interval)
+        self._courses = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self._check.interval = app.config.get('CACHE_VERSION_CHECK_SECONDS', self._check.interval)
+
+    def courses(self):
+        """Returns every course with its subjects, ordered by id."""
+        if self._check.moved():
+            self.invalidate()
+        with self._lock:
+            courses, generation = self._courses, self._generation
+        if courses is not None:
+            return courses
+
+        courses = self._load()
+        with self._lock:
+            # Don't store courses loaded before a concurrent invalidation.
+            if generation == self._generation:
+                self._courses = courses
+        return courses
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._courses = None
+
+    def _load(self):
+        subjects = {}
+        for subject in db.session.execute(db.select(Subject.id, Subject.name, Subject.course_id).order_by(Subject.id)):
+            subjects.setdefault(subject.course_id, []).append(CatalogSubject(*subject))
+        return [
+            CatalogCourse(course.id, course.name, subjects.get(course.id, []))
+            for course in db.session.execute(db.select(Course.id, Course.name).order_by(Course.id))
+        ]
+
+catalog = CatalogCache()
+track(CATALOG_VERSION, (Course, Subject), catalog.invalidate)
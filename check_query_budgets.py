@@ -0,0 +1,109 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from datetime import date
+
+# Point the app at a throwaway database before it is imported.
+DB_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(DB_DIR, 'query_budgets.db')
+
+from app import create_app
+from benchmark_routes import CREDENTIALS, ROUTES, sample_values
+from profiling import request_profiler
+from seed_data import seed
+
+# --- Query Budget Check ---
+# Seeds a few hundred students with seed_data.py, then requests every page
+# of the app (plus the list searches) as its role with profiling on, and
+# counts the SQL statements of a warm request, i.e. once the catalog,
+# settings, user and dashboard caches are filled. A route fails if it runs
+# more statements than its budget below, or if the profiler sees the same
+# statement repeated within the request (a lazy load per row). Each list
+# page shows far more rows than its budget, so a new N+1 always fails.
+# Budgets only shrink; a route without one fails until it is given one.
+#
+# Usage: python check_query_budgets.py   (exit status 1 on failures)
+
+QUERY_BUDGETS = {
+    'admin.admin_portal': 0,
+    'admin.manage_users': 1,
+    'admin.edit_user': 2,
+    'admin.manage_students': 1,
+    'admin.edit_student': 1,
+    'admin.financial_reports': 2,
+    'admin.institutional_settings': 0,
+    'admin.view_courses': 0,
+    'admin.edit_course': 1,
+    'admin.edit_subject': 1,
+    'admin.audit_logs': 3,
+    'admin.manage_appointments': 3,
+    'staff.staff_portal': 3,
+    'receptionist.receptionist_portal': 2,
+    'receptionist.add_enquiry': 0,
+    'receptionist.admit_student': 1,
+    'receptionist.direct_admission': 0,
+    'receptionist.schedule_appointment': 3,
+    'receptionist.free_slots': 3,
+    'receptionist.fees_management': 1,
+    'receptionist.collections': 2,
+    'receptionist.record_payment': 2,
+    'receptionist.student_profile': 4,
+}
+
+# List searches are form posts; (role, url, form data).
+SEARCHES = [
+    ('admin', '/admin_portal/manage_users', {'search_query': 'seed', 'role_filter': 'staff'}),
+    ('admin', '/admin_portal/manage_students', {'search_query': 'Sharma', 'course_filter': 'NEET'}),
+    ('receptionist', '/receptionist_portal/student_profile', {'search_query': 'Sharma', 'course_filter': ''}),
+]
+
+def statements(client, url, data):
+    """Status, statement count and repeated statements of a warm request."""
+    request = client.post if data is not None else client.get
+    request(url, data=data)
+    request_profiler.reset()
+    response = request(url, data=data)
+    (summary,) = request_profiler.routes()
+    return response.status_code, summary['endpoint'], int(summary['sql_count']), summary['repeated']
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed(students=400, payments=2000, enquiries=200, appointments=400, audit_logs=1000, staff=5,
+             seed_value=1, as_of=date.today(), years=1, chunk_size=5000)
+    # Long cache lifetimes keep the counts from depending on timing.
+    app = create_app({'TESTING': True, 'PROFILING_ENABLED': True, 'METRICS_CACHE_TTL': 3600,
+                      'USER_CACHE_TTL': 3600, 'CACHE_VERSION_CHECK_SECONDS': 3600})
+    with app.app_context():
+        values = sample_values()
+
+    failures = 0
+    print(f"{'Endpoint':<36}{'URL':<62}{'SQL':>5}{'Budget':>8}")
+    for role, (username, password) in CREDENTIALS.items():
+        client = app.test_client()
+        client.post('/login', data={'username': username, 'password': password})
+        pages = [(url.format(**values), None) for route_role, url in ROUTES if route_role == role]
+        pages += [(url, data) for search_role, url, data in SEARCHES if search_role == role]
+        for url, data in pages:
+            status, endpoint, count, repeated = statements(client, url, data)
+            budget = QUERY_BUDGETS.get(endpoint)
+            label = url if data is None else f'{url} (search)'
+            print(f"{endpoint:<36}{label[:60]:<62}{count:>5}{budget if budget is not None else '-':>8}")
+            if status != 200:
+                failures += 1
+                print(f"  returned {status}")
+            if budget is None or count > budget:
+                failures += 1
+                print(f"  {'no budget declared' if budget is None else 'over budget'}")
+            for statement, (most, _) in repeated:
+                failures += 1
+                print(f"  repeated {most} times: {' '.join(statement.split())[:150]}")
+
+    if failures:
+        print(f"\n{failures} query budget failure(s).")
+        sys.exit(1)
+    print("\nAll routes within their query budgets.")
+
+if __name__ == '__main__':
+    main()
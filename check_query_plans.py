@@ -0,0 +1,199 @@
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta, time
+
+# Point the app at a throwaway database before it is imported.
+DB_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(DB_DIR, 'query_plans.db')
+
+from sqlalchemy import event
+
+from app import create_app, create_initial_data
+from models import db, User, Staff, Receptionist, Enquiry, Student, Course, Subject, Appointment, Fee, AuditLog
+
+# --- Query Plan Regression Check ---
+# Seeds a database, drives every route through the test client, and runs
+# EXPLAIN QUERY PLAN on each SELECT/UPDATE/DELETE the routes issue. A plan
+# that scans a whole table fails the check unless the table is a small
+# reference table or the scan is already recorded in KNOWN_SCANS.
+#
+# Usage: python check_query_plans.py   (exit status 1 on regressions)
+
+# Small catalog and counter tables that routes read in full by design.
+REFERENCE_TABLES = {'user', 'staff', 'receptionist', 'course', 'subject', 'enquiry_status_count', 'setting'}
+
+# Full scans that exist today, keyed by endpoint. Shrink this as routes are
+# fixed; never grow it to make the check pass.
+KNOWN_SCANS = {
+    'admin.admin_portal': {'student', 'fee'},  # dashboard metrics cache refill
+    'admin.manage_students': {'student'},
+    'receptionist.student_profile': {'student'},
+}
+
+SCAN_PATTERN = re.compile(r'^SCAN (\S+)(.*)$')
+
+def seed(app):
+    create_initial_data(app)
+    staff_user = User.query.filter_by(username='staff_user').first()
+    receptionist_user = User.query.filter_by(username='receptionist_user').first()
+    staff = Staff(name='Staff Member', user_id=staff_user.id)
+    db.session.add_all([staff, Receptionist(name='Front Desk', user_id=receptionist_user.id)])
+
+    courses = [Course(name=name) for name in ('JEE', 'NEET', 'Foundation')]
+    db.session.add_all(courses)
+    db.session.flush()
+    db.session.add_all(Subject(name=f'Subject {i}', course_id=courses[i % 3].id) for i in range(9))
+
+    start = datetime(2025, 1, 1)
+    for i in range(300):
+        status = ('New', 'Admitted', 'Cancelled')[i % 3]
+        enquiry = Enquiry(name=f'Student {i}', contact=f'98{i:08d}', course_interest=courses[i % 3].name, status=status)
+        db.session.add(enquiry)
+        if status != 'Admitted':
+            continue
+        db.session.flush()
+        student = Student(name=enquiry.name, contact_no=enquiry.contact, enquiry_id=enquiry.id,
+                          date_of_admission=(start + timedelta(days=i)).date())
+        db.session.add(student)
+        db.session.flush()
+        fee = Fee(student_id=student.id, total_amount=12000.0, payment_plan='installments', num_installments=4)
+        db.session.add(fee)
+        for n in range(i % 4):
+            fee.add_payment(3000.0, (start + timedelta(days=i + 30 * n)).date())
+
+    for i in range(100):
+        day = start + timedelta(days=i)
+        db.session.add(Appointment(visitor_name=f'Visitor {i}', date=day.date(), time=time(10, 0), staff_id=staff.id))
+    db.session.add_all(
+        AuditLog(user_id=1, action='login', details='Seeded.', timestamp=start + timedelta(hours=i)) for i in range(500)
+    )
+    db.session.commit()
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+
+def routes():
+    """(role, method, url, form data) for every page and form post."""
+    return [
+        ('admin', 'GET', '/admin_portal', None),
+        ('admin', 'GET', '/admin_portal/manage_users', None),
+        ('admin', 'POST', '/admin_portal/manage_users', {'search_query': 'staff', 'role_filter': 'staff'}),
+        ('admin', 'GET', '/admin_portal/edit_user/2', None),
+        ('admin', 'GET', '/admin_portal/manage_students', None),
+        ('admin', 'POST', '/admin_portal/manage_students', {'search_query': 'Student 1', 'course_filter': 'JEE'}),
+        ('admin', 'GET', '/admin_portal/edit_student/1', None),
+        ('admin', 'POST', '/admin_portal/edit_student/1', {'student_name': 'Student 1'}),
+        ('admin', 'GET', '/admin_portal/financial_reports', None),
+        ('admin', 'GET', '/admin_portal/financial_reports?granularity=day&date_from=2025-03-01&date_to=2025-03-31', None),
+        ('admin', 'GET', '/admin_portal/institutional_settings', None),
+        ('admin', 'POST', '/admin_portal/institutional_settings', {'global_discount_percentage': '0'}),
+        ('admin', 'GET', '/admin_portal/courses', None),
+        ('admin', 'GET', '/admin_portal/edit_course/1', None),
+        ('admin', 'GET', '/admin_portal/edit_subject/1', None),
+        ('admin', 'GET', '/admin_portal/audit_logs', None),
+        ('admin', 'GET', '/admin_portal/audit_logs?user_id=1&action=login&date_from=2025-01-05&date_to=2025-01-10', None),
+        ('admin', 'GET', '/admin_portal/profiling', None),
+        ('admin', 'GET', '/admin_portal/manage_appointments', None),
+        ('admin', 'GET', '/admin_portal/manage_appointments?start=2025-01-01&days=31&staff_id=1', None),
+        ('staff', 'GET', '/staff_portal', None),
+        ('receptionist', 'GET', '/receptionist_portal', None),
+        ('receptionist', 'GET', '/receptionist_portal?status=Admitted&before=200', None),
+        ('receptionist', 'GET', '/receptionist_portal?status=New&q=Student 1', None),
+        ('receptionist', 'GET', '/receptionist_portal/add_enquiry', None),
+        ('receptionist', 'POST', '/receptionist_portal/add_enquiry', {'name': 'New Enquiry', 'contact': '9000000000', 'course_interest': 'JEE'}),
+        ('receptionist', 'GET', '/receptionist_portal/admit_student/1', None),
+        ('receptionist', 'POST', '/receptionist_portal/admit_student/1', {
+            'student_name': 'Student 0', 'course_name': 'JEE', 'date_of_admission': '2025-02-01',
+            'total_fees': '12000', 'payment_plan': 'installments', 'num_installments': '4', 'first_payment_amount': '3000'}),
+        ('receptionist', 'GET', '/receptionist_portal/direct_admission', None),
+        ('receptionist', 'POST', '/receptionist_portal/direct_admission', {
+            'student_name': 'Walk In', 'contact_no': '9111111111', 'course_name': 'NEET', 'date_of_admission': '2025-02-01',
+            'total_fees': '10000', 'payment_plan': 'full_payment', 'num_installments': '', 'first_payment_amount': '10000'}),
+        ('receptionist', 'GET', '/receptionist_portal/schedule_appointment', None),
+        ('receptionist', 'GET', '/receptionist_portal/schedule_appointment?staff_id=1', None),
+        ('receptionist', 'GET', '/receptionist_portal/free_slots?staff_id=1&after=2025-01-10T09:00', None),
+        ('receptionist', 'POST', '/receptionist_portal/schedule_appointment', {
+            'visitor_name': 'Parent', 'date': '2025-03-01', 'time': '11:00', 'staff_id': '1'}),
+        ('receptionist', 'GET', '/receptionist_portal/fees_management', None),
+        ('receptionist', 'GET', '/receptionist_portal/collections', None),
+        ('receptionist', 'GET', '/receptionist_portal/collections?view=overdue&cursor=2025-02-01_5', None),
+        ('receptionist', 'GET', '/receptionist_portal/fees_management?status=pending&per_page=25&after=10', None),
+        ('receptionist', 'GET', '/receptionist_portal/record_payment/1', None),
+        ('receptionist', 'POST', '/receptionist_portal/record_payment/1', {'payment_amount': '500'}),
+        ('receptionist', 'GET', '/receptionist_portal/student_profile', None),
+        ('receptionist', 'POST', '/receptionist_portal/student_profile', {'search_query': 'Student 2', 'course_filter': 'NEET'}),
+        ('receptionist', 'GET', '/receptionist_portal/student_profile/1', None),
+        ('receptionist', 'GET', '/receptionist_portal/cancel_enquiry/1', None),
+    ]
+
+CREDENTIALS = {
+    'admin': ('admin_user', 'admin_password'),
+    'staff': ('staff_user', 'staff_password'),
+    'receptionist': ('receptionist_user', 'receptionist_password'),
+}
+
+def full_scans(connection, statement, parameters):
+    plan = [row[3] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+    # A scan that already yields rows in ORDER BY order stops after LIMIT rows.
+    ordered_page = ' ORDER BY ' in statement.upper() and ' LIMIT ' in statement.upper()
+    stops_early = ordered_page and not any('TEMP B-TREE' in step for step in plan)
+    scans = set()
+    for step in plan:
+        match = SCAN_PATTERN.match(step)
+        if not match:
+            continue
+        table, rest = match.groups()
+        if stops_early or 'VIRTUAL TABLE' in rest or table.startswith(('anon_', '(')) or table == 'CONSTANT':
+            continue
+        scans.add(re.sub(r'_\d+$', '', table))  # staff_1 -> staff
+    return scans
+
+def check_query_plans():
+    app = create_app({'TESTING': True, 'AUDIT_LOG_ASYNC': False})
+    with app.app_context():
+        seed(app)
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            verb = statement.lstrip().split(None, 1)[0].upper()
+            if not executemany and verb in ('SELECT', 'UPDATE', 'DELETE') and not statement.lstrip().upper().startswith('SELECT NAME FROM SQLITE_MASTER'):
+                statements.append((statement, parameters))
+
+        client = app.test_client()
+        failures = []
+        current_role = None
+        for role, method, url, data in routes():
+            if role != current_role:
+                client.get('/logout')
+                username, password = CREDENTIALS[role]
+                client.post('/login', data={'username': username, 'password': password})
+                current_role = role
+
+            statements.clear()
+            event.listen(db.engine, 'before_cursor_execute', capture)
+            try:
+                response = client.open(url, method=method, data=data)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', capture)
+            if response.status_code >= 500:
+                failures.append(f"{method} {url}: HTTP {response.status_code}")
+                continue
+
+            endpoint = app.url_map.bind('localhost').match(url.split('?')[0], method=method)[0]
+            allowed = REFERENCE_TABLES | KNOWN_SCANS.get(endpoint, set())
+            with db.engine.connect() as connection:
+                for statement, parameters in statements:
+                    for table in full_scans(connection, statement, parameters) - allowed:
+                        failures.append(f"{method} {url}: full scan of {table}\n    {' '.join(statement.split())}")
+
+        if failures:
+            print("Query plan regressions:")
+            for failure in failures:
+                print(f"  {failure}")
+            return False
+        print(f"All query plans use indexes ({len(routes())} routes checked).")
+        return True
+
+if __name__ == '__main__':
+    sys.exit(0 if check_query_plans() else 1)
@@ -0,0 +1,27 @@
+import os
+from datetime import time
+
+# --- Configuration ---
+# Defaults for every app built by create_app() or database.create_db_app();
+# both take a dict of overrides. Values that differ between deployments
+# are read from the environment.
+
+class Config:
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'your_secret_key_here')
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///site.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'production')  # see database.ENGINE_PROFILES
+    METRICS_CACHE_TTL = 300  # seconds before dashboard counters are recomputed
+    AUDIT_LOG_ASYNC = True  # set False to commit audit entries inline (tests)
+    AUDIT_LOG_BATCH_SIZE = 100
+    AUDIT_LOG_FLUSH_INTERVAL_MS = 500
+    USER_CACHE_TTL = 30  # seconds a logged-in user's snapshot is reused
+    APPOINTMENT_SLOT_MINUTES = 30
+    OFFICE_HOURS = (time(9, 0), time(18, 0))  # free slots are offered within these hours
+    CACHE_VERSION_CHECK_SECONDS = 5  # how often other processes' course, settings and user edits are picked up
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))  # existing hashes are upgraded on login
+    BCRYPT_WORKERS = os.cpu_count() or 2
+    BCRYPT_QUEUE_LIMIT = None  # hashing jobs waiting or running before logins fail fast; None is 2 per worker
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'  # per-request timing, see profiling.py
+    PROFILING_SAMPLE_SIZE = 1000  # recent requests kept per route for percentiles
+    PROFILING_REPEAT_THRESHOLD = 5  # identical statements in one request flagged as a likely N+1
@@ -1,21 +1,21 @@
-from app import app, db, User, bcrypt
+from database import create_db_app
+from models import db, User
 import sys
 
 def create_user(username, password, role):
     """
     Creates a new user in the database.
     """
+    app = create_db_app()
     with app.app_context():
         # Check if the user already exists
         if User.query.filter_by(username=username).first():
             print(f"User '{username}' already exists.")
             return
 
-        # Hash the password for security
-        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
-
-        # Create a new User object
-        new_user = User(username=username, password_hash=hashed_password, role=role)
+        # Create a new User object and hash the password at the configured cost
+        new_user = User(username=username, role=role)
+        new_user.set_password(password)
         
         # Add the new user to the database session and commit
         db.session.add(new_user)
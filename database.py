@@ -0,0 +1,111 @@
+from flask import Flask
+from sqlalchemy import event
+
+from config import Config
+from models import db, bcrypt, password_hasher
+
+# --- SQLite Engine Profiles ---
+# Connection settings per environment, chosen with the DATABASE_PROFILE
+# config key. PRAGMAs are connection-scoped in SQLite, so they are applied
+# to every new pooled connection. WAL lets the dashboard and reports read
+# while a receptionist writes; busy_timeout makes a writer wait for the
+# lock instead of failing with "database is locked". synchronous=NORMAL
+# in WAL mode stays crash-safe and only syncs at checkpoints.
+
+ENGINE_PROFILES = {
+    # SQLite and SQLAlchemy defaults, as the app originally ran.
+    'default': {
+        'pragmas': {},
+        'engine_options': {},
+    },
+    'development': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'busy_timeout': 5000,
+        },
+        'engine_options': {},
+    },
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,          # ms a writer waits for the lock
+            'cache_size': -20000,          # negative means KiB, so ~20 MB per connection
+            'mmap_size': 268435456,        # 256 MB of the file read through mmap
+            'temp_store': 'MEMORY',
+        },
+        'engine_options': {
+            'pool_size': 10,
+            'max_overflow': 20,
+            'pool_timeout': 30,
+        },
+    },
+}
+
+def _profile(app):
+    name = app.config.get('DATABASE_PROFILE', 'default')
+    if name not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown DATABASE_PROFILE '{name}'; expected one of {', '.join(ENGINE_PROFILES)}.")
+    return ENGINE_PROFILES[name]
+
+def configure_engine(app):
+    """
+    Merges the profile's pool settings into SQLALCHEMY_ENGINE_OPTIONS.
+    Must run before db.init_app(app); explicit options in the config win.
+    """
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    # In-memory databases use a single static connection, not a sized pool.
+    if not uri.startswith('sqlite') or uri in ('sqlite://', 'sqlite:///:memory:'):
+        return
+    options = dict(_profile(app)['engine_options'])
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+def install_pragmas(app, engine):
+    """Applies the profile's PRAGMAs to each connection the engine opens."""
+    pragmas = dict(_profile(app)['pragmas'])
+    pragmas.update(app.config.get('SQLITE_PRAGMAS', {}))
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+def init_database(app, config=None):
+    """
+    Loads config.Config and the given overrides into app and binds the
+    model layer to it: engine profile, PRAGMAs and password hashing.
+    """
+    # Imported for their Session hooks, which keep the rollups, enquiry
+    # counters, installment schedules, search index and the catalog,
+    # settings and user cache versions in step with writes made from any
+    # entry point.
+    import catalog
+    import enquiry_queue
+    import installments
+    import rollups
+    import search
+    import settings
+    import user_cache
+
+    app.config.from_object(Config)
+    app.config.update(config or {})
+    configure_engine(app)
+    db.init_app(app)
+    with app.app_context():
+        install_pragmas(app, db.engine)
+    bcrypt.init_app(app)
+    password_hasher.init_app(app)
+
+def create_db_app(config=None):
+    """
+    An app with only the database layer, for CLI scripts and migrations;
+    it skips the routes, templates and in-process caches of create_app().
+    """
+    app = Flask(__name__)
+    init_database(app, config)
+    return app
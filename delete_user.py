@@ -1,10 +1,12 @@
-from app import app, db, User
+from database import create_db_app
+from models import db, User
 import sys
 
 def delete_user(username):
     """
     Deletes a user from the database by their username.
     """
+    app = create_db_app()
     with app.app_context():
         # Find the user in the database
         user = User.query.filter_by(username=username).first()
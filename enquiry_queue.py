@@ -0,0 +1,91 @@
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from models import db, Enquiry, EnquiryStatusCount
+from search import search_hits
+
+# --- Enquiry Queue ---
+# The receptionist portal shows one status at a time, newest first, a page
+# at a time, through the enquiry status index; open ('New') enquiries are
+# the default tab. Per-status counts live in enquiry_status_count and are
+# adjusted with upserts in the same transaction as the flush that adds,
+# re-statuses or deletes an enquiry. Bulk core inserts must call
+# apply_status_deltas() themselves; rebuild_status_counts() recounts.
+# A search on a tab ranks its matches through the enquiry_fts index.
+
+OPEN_STATUS = 'New'
+STATUSES = ('New', 'Admitted', 'Cancelled')
+
+def apply_status_deltas(connection, deltas):
+    table = EnquiryStatusCount.__table__
+    for status, delta in deltas.items():
+        if not delta:
+            continue
+        statement = insert(table).values(status=status, count=delta)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=['status'], set_={'count': table.c.count + delta}
+        ))
+
+def rebuild_status_counts(connection):
+    """Recounts every status from the enquiry table."""
+    table = EnquiryStatusCount.__table__
+    connection.execute(table.delete())
+    connection.execute(insert(table).from_select(
+        ['status', 'count'],
+        db.select(Enquiry.status, db.func.count()).group_by(Enquiry.status)
+    ))
+
+def status_counts(session):
+    counts = dict.fromkeys(STATUSES, 0)
+    counts.update(session.execute(db.select(EnquiryStatusCount.status, EnquiryStatusCount.count)).all())
+    return counts
+
+def queue_page(status, before=None, per_page=25):
+    """
+    One page of enquiries with the given status, newest first. Returns
+    (enquiries, next_before), where next_before is the cursor for the
+    following page or None on the last one.
+    """
+    query = Enquiry.query.filter(Enquiry.status == status)
+    if before:
+        query = query.filter(Enquiry.id < before)
+    enquiries = query.order_by(Enquiry.id.desc()).limit(per_page + 1).all()
+    if len(enquiries) > per_page:
+        return enquiries[:per_page], enquiries[per_page - 1].id
+    return enquiries, None
+
+def search_queue(status, text):
+    """
+    Enquiries with the given status whose name or contact matches text,
+    best match first, or None if text has nothing searchable.
+    """
+    hits = search_hits('enquiry_fts', text, db.select(Enquiry.id).where(Enquiry.status == status))
+    if hits is None:
+        return None
+    return Enquiry.query.join(hits, hits.c.id == Enquiry.id).order_by(hits.c.rank).all()
+
+@event.listens_for(Session, 'after_flush')
+def _update_status_counts(session, flush_context):
+    deltas = {}
+
+    def add(status, amount):
+        if status is not None:
+            deltas[status] = deltas.get(status, 0) + amount
+
+    for obj in session.new:
+        if isinstance(obj, Enquiry):
+            add(obj.status, 1)
+    for obj in session.deleted:
+        if isinstance(obj, Enquiry):
+            history = db.inspect(obj).attrs.status.history
+            add((history.deleted or history.unchanged or [obj.status])[0], -1)
+    for obj in session.dirty:
+        if isinstance(obj, Enquiry) and obj not in session.new:
+            history = db.inspect(obj).attrs.status.history
+            if history.deleted and history.added:
+                add(history.deleted[0], -1)
+                add(history.added[0], 1)
+
+    if any(deltas.values()):
+        apply_status_deltas(session.connection(), deltas)
@@ -0,0 +1,51 @@
+from flask import Blueprint, request, redirect, url_for, flash, Response, send_file, stream_with_context
+from flask_login import login_required, current_user
+from exports import EXPORTS, Workbook, iter_csv, gzip_chunks, write_xlsx
+from view_helpers import parse_date
+from datetime import date
+
+# --- Data Export Routes ---
+# Shared by the admin and receptionist portals.
+bp = Blueprint('exports', __name__)
+
+@bp.route('/exports/<dataset>')
+@login_required
+def export_data(dataset):
+    if current_user.role not in ('admin', 'receptionist'):
+        return redirect(url_for('auth.login'))
+
+    if dataset not in EXPORTS:
+        flash("Unknown export.", 'danger')
+        return redirect(request.referrer or url_for('auth.login'))
+
+    try:
+        filters = {
+            'course': request.args.get('course', ''),
+            'status': request.args.get('status', ''),
+            'date_from': parse_date(request.args.get('date_from')),
+            'date_to': parse_date(request.args.get('date_to')),
+        }
+    except ValueError:
+        flash("Invalid date range.", 'danger')
+        return redirect(request.referrer or url_for('auth.login'))
+
+    header, query = EXPORTS[dataset](filters)
+    filename = f"{dataset}_{date.today():%Y%m%d}"
+
+    if request.args.get('format') == 'xlsx':
+        if Workbook is None:
+            flash("XLSX export requires the openpyxl package.", 'danger')
+            return redirect(request.referrer or url_for('auth.login'))
+        return send_file(
+            write_xlsx(header, query),
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name=f"{filename}.xlsx"
+        )
+
+    chunks = stream_with_context(iter_csv(header, query))
+    headers = {'Content-Disposition': f'attachment; filename={filename}.csv'}
+    if request.args.get('gzip') and 'gzip' in request.headers.get('Accept-Encoding', ''):
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(chunks, mimetype='text/csv', headers=headers)
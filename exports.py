@@ -0,0 +1,105 @@
+import csv
+import io
+import tempfile
+import zlib
+
+from models import db, Enquiry, Student, Fee, Payment
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # XLSX exports are optional
+    Workbook = None
+
+# --- Data Exports ---
+# Each dataset is a single SELECT read with yield_per, so rows are fetched
+# and written in batches and memory stays flat however long the export is.
+
+EXPORT_BATCH_SIZE = 1000
+
+def students_export(filters):
+    query = db.select(
+        Student.id, Student.name, Student.father_name, Student.contact_no, Student.father_contact_no,
+        Enquiry.course_interest, Student.date_of_admission, Student.dob, Student.qualification,
+        Student.exam_type, Student.target_exam
+    ).outerjoin(Enquiry, Student.enquiry_id == Enquiry.id)
+    if filters.get('course'):
+        query = query.where(Enquiry.course_interest == filters['course'])
+    header = ['Student ID', 'Name', "Father's Name", 'Contact No.', "Father's Contact No.", 'Course',
+              'Date of Admission', 'Date of Birth', 'Qualification', 'Exam Type', 'Target Exam']
+    return header, query.order_by(Student.id)
+
+def fees_export(filters):
+    query = db.select(
+        Student.id, Student.name, Enquiry.course_interest, Fee.payment_plan, Fee.num_installments,
+        Fee.total_amount, Fee.amount_paid, Fee.pending_amount, Fee.status, Fee.last_paid_date
+    ).join(Student, Fee.student_id == Student.id).outerjoin(Enquiry, Student.enquiry_id == Enquiry.id)
+    if filters.get('status'):
+        query = query.where(Fee.status == filters['status'])
+    if filters.get('course'):
+        query = query.where(Enquiry.course_interest == filters['course'])
+    header = ['Student ID', 'Name', 'Course', 'Payment Plan', 'Installments', 'Total Fees',
+              'Amount Paid', 'Pending Amount', 'Status', 'Last Paid Date']
+    return header, query.order_by(Student.id, Fee.id)
+
+def payments_export(filters):
+    query = db.select(
+        Payment.id, Payment.payment_date, Student.id, Student.name, Enquiry.course_interest,
+        Payment.amount, Payment.notes
+    ).join(Fee, Payment.fee_id == Fee.id).join(Student, Fee.student_id == Student.id).outerjoin(
+        Enquiry, Student.enquiry_id == Enquiry.id
+    )
+    if filters.get('date_from'):
+        query = query.where(Payment.payment_date >= filters['date_from'])
+    if filters.get('date_to'):
+        query = query.where(Payment.payment_date <= filters['date_to'])
+    if filters.get('course'):
+        query = query.where(Enquiry.course_interest == filters['course'])
+    header = ['Payment ID', 'Payment Date', 'Student ID', 'Student Name', 'Course', 'Amount', 'Notes']
+    return header, query.order_by(Payment.payment_date, Payment.id)
+
+EXPORTS = {
+    'students': students_export,
+    'fees': fees_export,
+    'payments': payments_export,
+}
+
+def iter_rows(query):
+    result = db.session.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for partition in result.partitions():
+        yield from partition
+
+def iter_csv(header, query):
+    """Yields the CSV text in chunks of one fetched batch each."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for count, row in enumerate(iter_rows(query), 1):
+        writer.writerow(row)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def write_xlsx(header, query):
+    """
+    Writes the export to a temporary XLSX file with openpyxl's write-only
+    mode, which streams rows to disk, and returns the rewound file.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    for row in iter_rows(query):
+        sheet.append(list(row))
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
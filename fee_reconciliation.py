@@ -0,0 +1,110 @@
+import time
+from collections import Counter
+
+from sqlalchemy.orm import aliased
+
+from models import db, Fee, Installment, Payment
+from installments import OPEN
+
+# --- Fee Reconciliation ---
+# Fee.status is kept current by the payment routes, but it drifts after
+# manual corrections and refunds, and a fee becomes overdue without any
+# write at all when one of its installments passes its due date. These
+# set-based UPDATEs recompute, for one range of fee ids at a time, the
+# ledger totals from the payments, the installment allocation from the
+# totals and the status from both. Each batch is its own short write
+# transaction followed by a pause: SQLite's busy handler retries a waiting
+# writer only every 100 ms or so, and back-to-back batches would starve
+# the app's writes until the whole job finished.
+
+def status_expression(today):
+    """SQL for the status a fee should have on today's date."""
+    overdue = db.exists().where(Installment.fee_id == Fee.id, OPEN, Installment.due_date < today)
+    return db.case(
+        (Fee.amount_paid >= Fee.total_amount, 'paid'),
+        (overdue, 'overdue'),
+        (Fee.amount_paid > 0, 'partially_paid'),
+        else_='pending'
+    )
+
+def reconcile_ledger(connection, in_batch):
+    """Recomputes amount_paid/pending_amount from the payments; returns the number corrected."""
+    paid = db.select(db.func.coalesce(db.func.sum(Payment.amount), 0.0)).where(
+        Payment.fee_id == Fee.id
+    ).scalar_subquery()
+    return connection.execute(
+        db.update(Fee).where(in_batch, db.or_(
+            db.func.abs(Fee.amount_paid - paid) > 0.005,
+            db.func.abs(Fee.pending_amount - (Fee.total_amount - paid)) > 0.005
+        )).values(amount_paid=paid, pending_amount=Fee.total_amount - paid)
+    ).rowcount
+
+def reconcile_installments(connection, in_batch):
+    """
+    Re-applies each fee's amount_paid to its installments in sequence
+    order, matching installments.allocate(); returns the number corrected.
+    """
+    earlier = aliased(Installment)
+    before = db.select(db.func.coalesce(db.func.sum(earlier.amount), 0.0)).where(
+        earlier.fee_id == Installment.fee_id, earlier.sequence < Installment.sequence
+    ).scalar_subquery()
+    fee_paid = db.select(Fee.amount_paid).where(Fee.id == Installment.fee_id).scalar_subquery()
+    applied = db.func.round(db.func.min(Installment.amount, db.func.max(fee_paid - before, 0.0)), 2)
+    state = db.case(
+        (applied >= Installment.amount, 'paid'),
+        (applied > 0, 'partially_paid'),
+        else_='pending'
+    )
+    fee_ids = db.select(Fee.id).where(in_batch)
+    return connection.execute(
+        db.update(Installment).where(
+            Installment.fee_id.in_(fee_ids),
+            db.or_(db.func.abs(Installment.paid_amount - applied) > 0.005, Installment.state != state)
+        ).values(paid_amount=applied, state=state)
+    ).rowcount
+
+def reconcile_statuses(connection, in_batch, today):
+    """Sets every fee's status; returns a Counter of (old, new) status changes."""
+    status = status_expression(today)
+    changes = Counter({
+        (old, new): count for old, new, count in connection.execute(
+            db.select(Fee.status, status, db.func.count()).where(in_batch, Fee.status != status)
+            .group_by(Fee.status, status)
+        )
+    })
+    if changes:
+        connection.execute(db.update(Fee).where(in_batch, Fee.status != status).values(status=status))
+    return changes
+
+def reconcile_fees(engine, today, batch_size=5000, pause=0.1):
+    """
+    Reconciles every fee in batches of batch_size ids, sleeping pause
+    seconds between batches. Returns
+    (fees checked, ledgers corrected, installments corrected, status changes).
+    """
+    with engine.connect() as connection:
+        first_id, last_id, fee_count = connection.execute(
+            db.select(db.func.min(Fee.id), db.func.max(Fee.id), db.func.count(Fee.id))
+        ).one()
+
+    ledgers = installments = 0
+    changes = Counter()
+    start = first_id or 0
+    while last_id is not None and start <= last_id:
+        in_batch = Fee.id.between(start, start + batch_size - 1)
+        with engine.begin() as connection:
+            # The ledger UPDATE takes the write lock first, so the rest of
+            # the batch sees no concurrent payment half-applied.
+            ledgers += reconcile_ledger(connection, in_batch)
+            installments += reconcile_installments(connection, in_batch)
+            changes += reconcile_statuses(connection, in_batch, today)
+        start += batch_size
+        if start <= last_id:
+            time.sleep(pause)
+    return fee_count, ledgers, installments, changes
+
+def describe_changes(changes):
+    """One-line summary of status changes, e.g. 'partially_paid → overdue: 12'."""
+    if not changes:
+        return "no status changes"
+    return ", ".join(f"{old} → {new}: {count}" for (old, new), count in sorted(changes.items()))
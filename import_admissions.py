@@ -0,0 +1,40 @@
+from database import create_db_app
+from models import db
+from admission_import import parse_admissions, import_admissions
+import sys
+
+def import_admissions_csv(path, commit=False):
+    """
+    Validates an admissions CSV and prints a dry-run report. With commit,
+    imports every row in a single transaction if no row has errors.
+    """
+    app = create_db_app()
+    with app.app_context():
+        with open(path, encoding='utf-8-sig') as csv_file:
+            rows, errors = parse_admissions(csv_file.read())
+
+        for line, message in errors:
+            print(f"Line {line}: {message}")
+        print(f"{len(rows)} valid row(s), {len(errors)} row(s) with errors.")
+
+        if not commit:
+            print("Dry run only; re-run with --commit to import.")
+            return
+        if errors or not rows:
+            print("Nothing imported.")
+            return
+
+        try:
+            admitted, payments = import_admissions(rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        print(f"Imported {admitted} admission(s) with {payments} payment(s).")
+
+if __name__ == '__main__':
+    # Usage: python import_admissions.py admissions.csv [--commit]
+    if len(sys.argv) < 2:
+        print("Usage: python import_admissions.py admissions.csv [--commit]")
+        sys.exit(1)
+    import_admissions_csv(sys.argv[1], commit='--commit' in sys.argv[2:])
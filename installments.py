@@ -0,0 +1,154 @@
+import calendar
+import math
+from datetime import date
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import db, Enquiry, Student, Fee, Installment
+
+# --- Installment Schedules ---
+# Every fee gets a schedule when it is first flushed: one installment due
+# on the admission date for a full payment, otherwise num_installments
+# equal parts spaced ceil(12 / n) months apart from the admission date.
+# Payments are applied to installments in order, so whenever a fee's
+# amount_paid changes the schedule is re-allocated in the same flush, and
+# a fee with an unpaid installment past its due date is marked overdue.
+# Due-soon and overdue lists are range scans over the open-installment
+# due-date index; OPEN is written as literal SQL so SQLite can match it
+# against that partial index.
+
+OPEN = db.text("installment.state != 'paid'")
+
+def add_months(day, months):
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+def plan(total_amount, payment_plan, num_installments, start):
+    """Returns [(sequence, due_date, amount)] for a fee admitted on start."""
+    count = num_installments if payment_plan == 'installments' and num_installments else 1
+    interval = math.ceil(12 / count)
+    share = round(total_amount / count, 2)
+    amounts = [share] * (count - 1) + [round(total_amount - share * (count - 1), 2)]
+    return [(sequence + 1, add_months(start, sequence * interval), amount) for sequence, amount in enumerate(amounts)]
+
+def allocate(amounts, paid):
+    """Spreads paid over the installment amounts in order; returns [(paid_amount, state)]."""
+    allocation = []
+    for amount in amounts:
+        applied = round(min(amount, max(paid, 0.0)), 2)
+        paid = round(paid - applied, 2)
+        if applied >= amount:
+            state = 'paid'
+        elif applied > 0:
+            state = 'partially_paid'
+        else:
+            state = 'pending'
+        allocation.append((applied, state))
+    return allocation
+
+def _admission_date(session, fee):
+    student = fee.student or session.get(Student, fee.student_id)
+    if student is not None and student.date_of_admission is not None:
+        return student.date_of_admission
+    return date.today()
+
+def is_overdue(schedule, today=None):
+    """True if an installment not yet fully paid was due before today."""
+    today = today or date.today()
+    return any(installment.state != 'paid' and installment.due_date < today for installment in schedule)
+
+def reconcile(fee):
+    """Applies the fee's amount_paid to its installments and marks the fee overdue if one is late."""
+    schedule = fee.installments
+    for installment, (paid_amount, state) in zip(schedule, allocate([i.amount for i in schedule], fee.amount_paid or 0.0)):
+        installment.paid_amount = paid_amount
+        installment.state = state
+    if fee.status != 'paid' and is_overdue(schedule):
+        fee.status = 'overdue'
+
+@event.listens_for(Session, 'before_flush')
+def _maintain_schedules(session, flush_context, instances):
+    with session.no_autoflush:
+        for obj in list(session.new):
+            if isinstance(obj, Fee) and not obj.installments:
+                start = _admission_date(session, obj)
+                obj.installments = [
+                    Installment(sequence=sequence, due_date=due_date, amount=amount)
+                    for sequence, due_date, amount in plan(obj.total_amount, obj.payment_plan, obj.num_installments, start)
+                ]
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, Fee) and (obj in session.new or db.inspect(obj).attrs.amount_paid.history.has_changes()):
+                reconcile(obj)
+
+def _collections_query(*criteria):
+    return db.select(
+        Installment.id, Installment.sequence, Installment.due_date, Installment.amount, Installment.paid_amount,
+        Fee.num_installments, Student.id.label('student_id'), Student.name, Student.contact_no,
+        Enquiry.course_interest
+    ).join(Fee, Installment.fee_id == Fee.id).join(Student, Fee.student_id == Student.id).outerjoin(
+        Enquiry, Student.enquiry_id == Enquiry.id
+    ).where(OPEN, *criteria)
+
+def collections_page(date_from=None, date_to=None, after=None, per_page=50):
+    """
+    Open installments due date_from..date_to (either end optional), oldest
+    due first. after is the (due_date, id) of the previous page's last row.
+    Returns (rows, next_after).
+    """
+    criteria = []
+    if date_from is not None:
+        criteria.append(Installment.due_date >= date_from)
+    if date_to is not None:
+        criteria.append(Installment.due_date <= date_to)
+    if after is not None:
+        criteria.append(db.tuple_(Installment.due_date, Installment.id) > after)
+    rows = db.session.execute(
+        _collections_query(*criteria).order_by(Installment.due_date, Installment.id).limit(per_page + 1)
+    ).all()
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        return rows, (rows[-1].due_date, rows[-1].id)
+    return rows, None
+
+def collections_total(date_from=None, date_to=None):
+    """Number of open installments and the amount outstanding on them in the range."""
+    query = db.select(
+        db.func.count(Installment.id), db.func.coalesce(db.func.sum(Installment.amount - Installment.paid_amount), 0.0)
+    ).where(OPEN)
+    if date_from is not None:
+        query = query.where(Installment.due_date >= date_from)
+    if date_to is not None:
+        query = query.where(Installment.due_date <= date_to)
+    return db.session.execute(query).one()
+
+def rows_for_fees(fee_rows):
+    """
+    Installment rows for bulk inserts. fee_rows are dicts with id,
+    total_amount, payment_plan, num_installments, amount_paid and start.
+    """
+    rows = []
+    for fee in fee_rows:
+        schedule = plan(fee['total_amount'], fee['payment_plan'], fee['num_installments'], fee['start'])
+        allocation = allocate([amount for _, _, amount in schedule], fee['amount_paid'])
+        for (sequence, due_date, amount), (paid_amount, state) in zip(schedule, allocation):
+            rows.append({
+                'fee_id': fee['id'], 'sequence': sequence, 'due_date': due_date,
+                'amount': amount, 'paid_amount': paid_amount, 'state': state,
+            })
+    return rows
+
+def backfill_schedules(connection):
+    """Creates schedules for fees that have none, starting at the admission date."""
+    start = db.func.coalesce(Student.date_of_admission, Enquiry.joining_date, db.func.date('now'))
+    fees = connection.execute(
+        db.select(Fee.id, Fee.total_amount, Fee.payment_plan, Fee.num_installments, Fee.amount_paid, start.label('start'))
+        .join(Student, Fee.student_id == Student.id).outerjoin(Enquiry, Student.enquiry_id == Enquiry.id)
+        .where(~db.exists().where(Installment.fee_id == Fee.id))
+    ).mappings().all()
+    fee_rows = [dict(fee, start=date.fromisoformat(str(fee['start']))) for fee in fees]
+    rows = rows_for_fees(fee_rows)
+    if rows:
+        connection.execute(db.insert(Installment), rows)
+    return len(fee_rows)
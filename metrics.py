@@ -0,0 +1,110 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models import db, Student, Staff, Fee, Payment
+
+# --- Dashboard Metrics Cache ---
+# Holds the admin dashboard counters in process memory. Committed ORM writes
+# apply deltas to the cached values; deletions invalidate them outright and
+# the TTL bounds staleness from writes made by other processes or bulk SQL.
+
+def _positive(value):
+    return max(value or 0.0, 0.0)
+
+def _history_delta(obj, attr, transform=lambda value: value or 0.0):
+    history = db.inspect(obj).attrs[attr].history
+    if not history.has_changes():
+        return 0.0
+    old = history.deleted[0] if history.deleted else None
+    new = history.added[0] if history.added else None
+    return transform(new) - transform(old)
+
+class DashboardMetrics:
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._values = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('METRICS_CACHE_TTL', self.ttl)
+        # create_app() may run more than once per process; listen only once.
+        if not event.contains(Session, 'after_commit', self._after_commit):
+            event.listen(Session, 'after_flush', self._after_flush)
+            event.listen(Session, 'after_commit', self._after_commit)
+            event.listen(Session, 'after_rollback', self._after_rollback)
+
+    def get(self):
+        with self._lock:
+            if self._values is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return dict(self._values)
+
+        values = self._compute()
+        with self._lock:
+            self._values = values
+            self._loaded_at = time.monotonic()
+        return dict(values)
+
+    def invalidate(self):
+        with self._lock:
+            self._values = None
+
+    def _compute(self):
+        total_students = db.session.query(db.func.count(Student.id)).scalar()
+        total_staff = db.session.query(db.func.count(Staff.id)).scalar()
+        fees_collected, pending_fees = db.session.query(
+            db.func.coalesce(db.func.sum(Fee.amount_paid), 0.0),
+            db.func.coalesce(db.func.sum(db.case((Fee.pending_amount > 0, Fee.pending_amount), else_=0.0)), 0.0)
+        ).one()
+        return {
+            'total_students': total_students,
+            'total_staff': total_staff,
+            'fees_collected': fees_collected,
+            'pending_fees': pending_fees,
+        }
+
+    def _after_flush(self, session, flush_context):
+        pending = session.info.setdefault('dashboard_metrics', {'invalidate': False, 'deltas': {}})
+        deltas = pending['deltas']
+
+        def add(key, amount):
+            deltas[key] = deltas.get(key, 0) + amount
+
+        for obj in session.deleted:
+            if isinstance(obj, (Student, Staff, Fee, Payment)):
+                pending['invalidate'] = True
+
+        for obj in session.new:
+            if isinstance(obj, Student):
+                add('total_students', 1)
+            elif isinstance(obj, Staff):
+                add('total_staff', 1)
+            elif isinstance(obj, Fee):
+                add('fees_collected', obj.amount_paid or 0.0)
+                add('pending_fees', _positive(obj.pending_amount))
+
+        for obj in session.dirty:
+            if isinstance(obj, Fee) and obj not in session.new:
+                add('fees_collected', _history_delta(obj, 'amount_paid'))
+                add('pending_fees', _history_delta(obj, 'pending_amount', _positive))
+
+    def _after_commit(self, session):
+        pending = session.info.pop('dashboard_metrics', None)
+        if pending is None:
+            return
+        with self._lock:
+            if self._values is None:
+                return
+            if pending['invalidate']:
+                self._values = None
+                return
+            for key, amount in pending['deltas'].items():
+                self._values[key] += amount
+
+    def _after_rollback(self, session):
+        session.info.pop('dashboard_metrics', None)
+
+dashboard_metrics = DashboardMetrics()
@@ -0,0 +1,131 @@
+from models import db, Fee, Payment
+from search import install_search_indexes
+from rollups import rebuild_revenue_rollups
+from enquiry_queue import rebuild_status_counts
+from installments import backfill_schedules
+
+# --- Schema Migrations ---
+# db.create_all() only creates missing tables, so changes to existing tables
+# are applied here. The schema version lives in SQLite's PRAGMA user_version;
+# upgrade_database() runs every migration above it in order. Migrations are
+# idempotent, so running them on a database created at the latest schema is
+# harmless.
+
+def _columns(connection, table):
+    return {column['name'] for column in db.inspect(connection).get_columns(table)}
+
+def _create_model_indexes(connection, *tables):
+    for table in tables:
+        for index in db.metadata.tables[table].indexes:
+            index.create(connection, checkfirst=True)
+
+def add_fee_ledger_columns(connection):
+    existing = _columns(connection, 'fee')
+    for column in ('amount_paid', 'pending_amount'):
+        if column not in existing:
+            connection.exec_driver_sql(f"ALTER TABLE fee ADD COLUMN {column} FLOAT NOT NULL DEFAULT 0")
+
+    paid = db.select(db.func.coalesce(db.func.sum(Payment.amount), 0.0)).where(
+        Payment.fee_id == Fee.__table__.c.id
+    ).scalar_subquery()
+    connection.execute(
+        db.update(Fee.__table__).values(amount_paid=paid, pending_amount=Fee.__table__.c.total_amount - paid)
+    )
+
+def add_audit_log_indexes(connection):
+    _create_model_indexes(connection, 'audit_log')
+
+def add_search_indexes(connection):
+    install_search_indexes(connection)
+
+def add_foreign_key_and_filter_indexes(connection):
+    _create_model_indexes(connection, 'fee', 'payment', 'enquiry', 'subject', 'appointment')
+
+# (table, column, nullable) pairs converted from free-form strings to dates.
+DATE_COLUMNS = [
+    ('payment', 'payment_date', False),
+    ('student', 'date_of_admission', True),
+    ('enquiry', 'joining_date', True),
+    ('appointment', 'date', False),
+    ('fee', 'last_paid_date', True),
+]
+
+def convert_dates_to_native_types(connection):
+    """
+    SQLite stores DATE/TIME as ISO text, so the conversion normalizes the
+    existing strings in place: blank or unparseable optional dates become
+    NULL, times get the HH:MM:SS.ffffff form the Time type reads back, and
+    fee.last_paid_date is backfilled from the payment history.
+    """
+    for table, column, nullable in DATE_COLUMNS:
+        if nullable:
+            connection.exec_driver_sql(f"UPDATE {table} SET {column} = NULL WHERE date({column}) IS NULL")
+        connection.exec_driver_sql(
+            f"UPDATE {table} SET {column} = date({column}) WHERE date({column}) IS NOT NULL AND {column} != date({column})"
+        )
+    connection.exec_driver_sql(
+        "UPDATE appointment SET time = strftime('%H:%M:%S', time) || '.000000' "
+        "WHERE time(time) IS NOT NULL AND time NOT LIKE '__:__:__.______'"
+    )
+    connection.exec_driver_sql(
+        "UPDATE fee SET last_paid_date = (SELECT max(payment_date) FROM payment WHERE payment.fee_id = fee.id)"
+    )
+    _create_model_indexes(connection, 'payment', 'student')
+
+def build_revenue_rollups(connection):
+    rebuild_revenue_rollups(connection)
+
+def add_user_is_active_column(connection):
+    # User.is_active used to be shadowed by a method, so the column was
+    # never created and deactivation was not persisted.
+    if 'is_active' not in _columns(connection, 'user'):
+        connection.exec_driver_sql('ALTER TABLE "user" ADD COLUMN is_active BOOLEAN NOT NULL DEFAULT 1')
+
+def count_enquiry_statuses(connection):
+    rebuild_status_counts(connection)
+
+def add_installment_schedules(connection):
+    backfill_schedules(connection)
+
+MIGRATIONS = [
+    (1, 'Stored fee ledger totals', add_fee_ledger_columns),
+    (2, 'Audit log composite indexes', add_audit_log_indexes),
+    (3, 'Full-text search indexes', add_search_indexes),
+    (4, 'Foreign key and filter column indexes', add_foreign_key_and_filter_indexes),
+    (5, 'Native date and time columns', convert_dates_to_native_types),
+    (6, 'Revenue rollups', build_revenue_rollups),
+    (7, 'User active flag', add_user_is_active_column),
+    (8, 'Enquiry status counters', count_enquiry_statuses),
+    (9, 'Installment schedules', add_installment_schedules),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def schema_version(connection):
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+def upgrade_database():
+    """
+    Creates missing tables and applies pending migrations, each in its own
+    transaction together with the version bump. Must run in an app context.
+    """
+    db.create_all()
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        with db.engine.begin() as connection:
+            if schema_version(connection) >= version:
+                continue
+            migrate(connection)
+            connection.exec_driver_sql(f"PRAGMA user_version = {version}")
+        applied.append((version, description))
+    return applied
+
+if __name__ == '__main__':
+    from database import create_db_app
+
+    app = create_db_app()
+    with app.app_context():
+        for version, description in upgrade_database():
+            print(f"Applied migration {version}: {description}.")
+        with db.engine.connect() as connection:
+            print(f"Database schema is at version {schema_version(connection)}.")
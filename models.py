@@ -1,10 +1,13 @@
 from flask_login import UserMixin
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime
+from passwords import PasswordHasher
 
 db = SQLAlchemy()
 bcrypt = Bcrypt()
+password_hasher = PasswordHasher(bcrypt)
 
 # --- User Model ---
 class User(db.Model, UserMixin):
@@ -20,19 +23,19 @@ class User(db.Model, UserMixin):
         return f"User('{self.username}', '{self.role}')"
     
     def set_password(self, password):
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
 
-    def is_active(self):
-        return self.is_active
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
 
 # --- Student Model ---
 class Student(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    date_of_admission = db.Column(db.String(20), nullable=True)
+    date_of_admission = db.Column(db.Date, nullable=True, index=True)
     enquiry_id = db.Column(db.Integer, db.ForeignKey('enquiry.id'), unique=True, nullable=True)
     enquiry = db.relationship('Enquiry', backref='student', uselist=False)
     
@@ -65,9 +68,20 @@ class Enquiry(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     contact = db.Column(db.String(100), nullable=False)
-    course_interest = db.Column(db.String(100), nullable=True)
-    status = db.Column(db.String(20), nullable=False, default='New')
-    joining_date = db.Column(db.String(20), nullable=True)
+    course_interest = db.Column(db.String(100), nullable=True, index=True)
+    # active_history loads the old status before it is overwritten, even on
+    # an expired instance, so enquiry_queue knows which count to decrement.
+    status = db.column_property(
+        db.Column(db.String(20), nullable=False, default='New', index=True), active_history=True
+    )
+    joining_date = db.Column(db.Date, nullable=True)
+
+# --- Enquiry Status Count Model ---
+# Running number of enquiries per status, kept current by enquiry_queue.py
+# so the receptionist portal's tab counters never count the enquiry table.
+class EnquiryStatusCount(db.Model):
+    status = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
 
 # --- Course Model ---
 class Course(db.Model):
@@ -79,50 +93,161 @@ class Course(db.Model):
 class Subject(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    course_id = db.Column(db.Integer, db.ForeignKey('course.id'), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('course.id'), nullable=False, index=True)
 
 class Appointment(db.Model):
+    __table_args__ = (
+        db.Index('ix_appointment_staff_id_date', 'staff_id', 'date', 'time'),
+        db.Index('ix_appointment_date_time', 'date', 'time'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     visitor_name = db.Column(db.String(100), nullable=False)
     visitor_contact = db.Column(db.String(100), nullable=True)
     purpose = db.Column(db.String(200), nullable=True)
-    date = db.Column(db.String(20), nullable=False)
-    time = db.Column(db.String(20), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    time = db.Column(db.Time, nullable=False)
     staff_id = db.Column(db.Integer, db.ForeignKey('staff.id'), nullable=False)
     staff = db.relationship('Staff', backref='appointments')
 
 # --- Fee Model ---
 class Fee(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False, index=True)
     total_amount = db.Column(db.Float, nullable=False)
     payment_plan = db.Column(db.String(50), nullable=False)
     num_installments = db.Column(db.Integer, nullable=True)
-    status = db.Column(db.String(50), nullable=False, default='pending')
+    status = db.Column(db.String(50), nullable=False, default='pending', index=True)
     payments = db.relationship('Payment', backref='fee', lazy=True, cascade='all, delete-orphan')
-    last_paid_date = db.Column(db.String(20), nullable=True)
+    installments = db.relationship('Installment', backref='fee', lazy=True, cascade='all, delete-orphan',
+                                   order_by='Installment.sequence')
+    last_paid_date = db.Column(db.Date, nullable=True)
+
+    # Ledger totals are stored and maintained alongside every payment write,
+    # so reading them never has to load the payment history.
+    amount_paid = db.Column(db.Float, nullable=False, default=0.0)
+    pending_amount = db.Column(db.Float, nullable=False, default=0.0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.amount_paid is None:
+            self.amount_paid = 0.0
+        if self.pending_amount is None:
+            self.pending_amount = self.total_amount - self.amount_paid
+
+    def add_payment(self, amount, payment_date, notes=None):
+        """
+        Records a payment against this fee and updates the stored totals
+        and status in the same transaction.
+        """
+        payment = Payment(fee=self, amount=amount, payment_date=payment_date, notes=notes)
+        db.session.add(payment)
+
+        paid = self.amount_paid or 0.0
+        if self.id is not None:
+            # Increment the stored totals in SQL, which also takes the write
+            # lock, so two payments on the same fee can never both start from
+            # the same old total. The loaded fee is then moved from the total
+            # as of that UPDATE to the new one, so the installment and
+            # dashboard hooks still see the change.
+            paid = db.session.execute(
+                db.update(Fee).where(Fee.id == self.id).values(
+                    amount_paid=Fee.amount_paid + amount,
+                    pending_amount=Fee.total_amount - (Fee.amount_paid + amount),
+                ).returning(Fee.amount_paid).execution_options(synchronize_session=False)
+            ).scalar_one() - amount
+            set_committed_value(self, 'amount_paid', paid)
+            set_committed_value(self, 'pending_amount', self.total_amount - paid)
+
+        self.amount_paid = paid + amount
+        self.pending_amount = self.total_amount - self.amount_paid
+        self.last_paid_date = payment_date
+        self.refresh_status()
+        return payment
+
+    def refresh_status(self):
+        if self.amount_paid >= self.total_amount:
+            self.status = 'paid'
+        elif self.amount_paid > 0:
+            self.status = 'partially_paid'
+        else:
+            self.status = 'pending'
+    
+# --- Installment Model ---
+# The fee's payment schedule, generated at admission and kept reconciled
+# with the fee's amount_paid by installments.py. Open installments are
+# indexed by due date so due-soon and overdue lists are range scans.
+class Installment(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('fee_id', 'sequence', name='uq_installment_fee_sequence'),
+        db.Index('ix_installment_open_due_date', 'due_date', sqlite_where=db.text("state != 'paid'")),
+    )
 
-    @property
-    def amount_paid(self):
-        return sum(payment.amount for payment in self.payments)
+    id = db.Column(db.Integer, primary_key=True)
+    fee_id = db.Column(db.Integer, db.ForeignKey('fee.id'), nullable=False)
+    sequence = db.Column(db.Integer, nullable=False)
+    due_date = db.Column(db.Date, nullable=False)
+    amount = db.Column(db.Float, nullable=False)
+    paid_amount = db.Column(db.Float, nullable=False, default=0.0)
+    state = db.Column(db.String(20), nullable=False, default='pending')  # pending, partially_paid, paid
 
     @property
-    def pending_amount(self):
-        return self.total_amount - self.amount_paid
-    
+    def outstanding(self):
+        return self.amount - self.paid_amount
+
 # --- Payment Model for Transaction History ---
 class Payment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    fee_id = db.Column(db.Integer, db.ForeignKey('fee.id'), nullable=False)
+    fee_id = db.Column(db.Integer, db.ForeignKey('fee.id'), nullable=False, index=True)
     amount = db.Column(db.Float, nullable=False)
-    payment_date = db.Column(db.String(20), nullable=False)
+    payment_date = db.Column(db.Date, nullable=False, index=True)
     notes = db.Column(db.String(200), nullable=True)
 
 # --- Audit Log Model ---
 class AuditLog(db.Model):
+    __table_args__ = (
+        db.Index('ix_audit_log_timestamp_id', 'timestamp', 'id'),
+        db.Index('ix_audit_log_user_id_timestamp', 'user_id', 'timestamp', 'id'),
+        db.Index('ix_audit_log_action_timestamp', 'action', 'timestamp', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     action = db.Column(db.String(200), nullable=False)
     details = db.Column(db.String(500), nullable=True)
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    user = db.relationship('User', backref='audit_logs')
\ No newline at end of file
+    user = db.relationship('User', backref='audit_logs')
+
+# --- Revenue Rollup Model ---
+# Pre-aggregated billed/collected totals per course and day or month, kept
+# current by rollups.py so financial reports never scan the payment table.
+class RevenueRollup(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('granularity', 'period_start', 'course', name='uq_revenue_rollup_period_course'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    course = db.Column(db.String(100), nullable=False)
+    granularity = db.Column(db.String(10), nullable=False)  # 'day' or 'month'
+    period_start = db.Column(db.Date, nullable=False)
+    billed = db.Column(db.Float, nullable=False, default=0.0)
+    collected = db.Column(db.Float, nullable=False, default=0.0)
+
+    @property
+    def outstanding(self):
+        return self.billed - self.collected
+
+# --- Cache Version Model ---
+# One row per cached dataset. Writers bump the version in the same
+# transaction as the change so every worker process can tell its in-memory
+# copy is stale with a primary-key lookup.
+class CacheVersion(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+# --- Setting Model ---
+# Institution-wide settings shared by every worker process; values are
+# stored as JSON and read through the cache in settings.py.
+class Setting(db.Model):
+    key = db.Column(db.String(100), primary_key=True)
+    value = db.Column(db.Text, nullable=False)
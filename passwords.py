@@ -0,0 +1,76 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+# --- Password Hashing Pool ---
+# bcrypt is deliberately slow, so hashing and verification run on a small
+# bounded thread pool instead of tying up every request thread during a
+# burst of logins. When BCRYPT_QUEUE_LIMIT jobs are already waiting or
+# running, new ones fail fast with HashingOverloaded so the route can answer
+# at once instead of queueing behind the storm. The default limit is two
+# jobs per worker, so an accepted job waits at most about two hashes; a job
+# that still times out is cancelled if it has not started, freeing its slot
+# (a running bcrypt call cannot be interrupted). The cost factor comes from
+# BCRYPT_LOG_ROUNDS; needs_rehash() spots hashes made with another cost so
+# login can upgrade them.
+
+class HashingOverloaded(RuntimeError):
+    pass
+
+class PasswordHasher:
+    def __init__(self, bcrypt):
+        self.bcrypt = bcrypt
+        self.rounds = 12
+        self.workers = 2
+        self.queue_limit = 4
+        self.timeout = 10
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.workers = app.config.get('BCRYPT_WORKERS', os.cpu_count() or 2)
+        self.queue_limit = app.config.get('BCRYPT_QUEUE_LIMIT') or self.workers * 2
+        self.timeout = app.config.get('BCRYPT_TIMEOUT', 10)
+
+    def hash(self, password):
+        return self._run(self.bcrypt.generate_password_hash, password, self.rounds).decode('utf-8')
+
+    def verify(self, password_hash, password):
+        return self._run(self.bcrypt.check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when the hash was made with a different cost than BCRYPT_LOG_ROUNDS."""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def _run(self, function, *args):
+        executor, slots = self._ensure_started()
+        if not slots.acquire(blocking=False):
+            raise HashingOverloaded("Too many password checks in progress.")
+        try:
+            future = executor.submit(function, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise HashingOverloaded("Password check timed out.")
+
+    def _ensure_started(self):
+        # Like the audit writer, each pre-forked worker process needs its own pool.
+        if self._executor is not None and self._pid == os.getpid():
+            return self._executor, self._slots
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+                self._slots = threading.BoundedSemaphore(self.queue_limit)
+                self._pid = os.getpid()
+        return self._executor, self._slots
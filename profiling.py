@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import Counter, deque
+
+from flask import g, has_request_context, request, before_render_template, template_rendered
+from sqlalchemy import event
+
+from models import db
+
+# --- Request Profiler ---
+# Opt-in with PROFILING_ENABLED. For every request it records wall time,
+# the number of SQL statements and the time spent in them (engine cursor
+# events) and the time spent rendering templates (Flask's render signals),
+# and keeps per-endpoint samples for percentiles. A statement executed
+# PROFILING_REPEAT_THRESHOLD or more times with identical SQL in one request
+# is flagged as a likely N+1 lazy load. Statistics are per worker process.
+# With profiling off, init_app() installs no hooks at all.
+
+HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500)
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+class RouteStats:
+    def __init__(self, sample_size):
+        self.requests = 0
+        self.samples = deque(maxlen=sample_size)  # (wall, sql_count, sql, template) in ms
+        self.histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.repeated = {}  # statement -> [most executions in one request, requests flagged]
+
+    def add(self, sample, repeated):
+        self.requests += 1
+        self.samples.append(sample)
+        bucket = next((i for i, bound in enumerate(HISTOGRAM_BUCKETS_MS) if sample[0] <= bound), len(HISTOGRAM_BUCKETS_MS))
+        self.histogram[bucket] += 1
+        for statement, count in repeated.items():
+            entry = self.repeated.setdefault(statement, [0, 0])
+            entry[0] = max(entry[0], count)
+            entry[1] += 1
+
+    def summary(self, endpoint):
+        walls = [sample[0] for sample in self.samples]
+        count = len(self.samples) or 1
+        return {
+            'endpoint': endpoint,
+            'requests': self.requests,
+            'p50': percentile(walls, 0.5),
+            'p95': percentile(walls, 0.95),
+            'max': max(walls, default=0.0),
+            'sql_count': sum(sample[1] for sample in self.samples) / count,
+            'sql_ms': sum(sample[2] for sample in self.samples) / count,
+            'template_ms': sum(sample[3] for sample in self.samples) / count,
+            'histogram': list(self.histogram),
+            'repeated': sorted(self.repeated.items(), key=lambda item: -item[1][0]),
+        }
+
+class RequestProfiler:
+    def __init__(self):
+        self.sample_size = 1000
+        self.repeat_threshold = 5
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        if not app.config.get('PROFILING_ENABLED', False):
+            return
+        self.sample_size = app.config.get('PROFILING_SAMPLE_SIZE', self.sample_size)
+        self.repeat_threshold = app.config.get('PROFILING_REPEAT_THRESHOLD', self.repeat_threshold)
+        self.logger = app.logger
+
+        app.before_request(self._start_request)
+        app.teardown_request(self._finish_request)
+        before_render_template.connect(self._start_render, app)
+        template_rendered.connect(self._finish_render, app)
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._start_statement)
+            event.listen(db.engine, 'after_cursor_execute', self._finish_statement)
+
+    def routes(self):
+        """Per-endpoint summaries, slowest p95 first."""
+        with self._lock:
+            summaries = [stats.summary(endpoint) for endpoint, stats in self._routes.items()]
+        return sorted(summaries, key=lambda summary: -summary['p95'])
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+
+    # Statements run outside a request (audit writer, scripts) are ignored.
+    def _profile(self):
+        return g.get('request_profile') if has_request_context() else None
+
+    def _start_request(self):
+        g.request_profile = {
+            'started': time.perf_counter(),
+            'sql_count': 0,
+            'sql': 0.0,
+            'template': 0.0,
+            'statements': Counter(),
+            'statement_started': None,
+            'renders': [],
+        }
+
+    def _finish_request(self, exception=None):
+        profile = self._profile()
+        if profile is None:
+            return
+        wall = (time.perf_counter() - profile['started']) * 1000
+        endpoint = request.endpoint or '(unmatched)'
+        repeated = {statement: count for statement, count in profile['statements'].items() if count >= self.repeat_threshold}
+        with self._lock:
+            stats = self._routes.get(endpoint)
+            if stats is None:
+                stats = self._routes[endpoint] = RouteStats(self.sample_size)
+            first_sighting = [statement for statement in repeated if statement not in stats.repeated]
+            stats.add((wall, profile['sql_count'], profile['sql'] * 1000, profile['template'] * 1000), repeated)
+        for statement in first_sighting:
+            self.logger.warning("Possible N+1 in %s: %d identical statements in one request: %s",
+                                endpoint, repeated[statement], ' '.join(statement.split())[:200])
+
+    def _start_statement(self, conn, cursor, statement, parameters, context, executemany):
+        profile = self._profile()
+        if profile is not None:
+            profile['statement_started'] = time.perf_counter()
+
+    def _finish_statement(self, conn, cursor, statement, parameters, context, executemany):
+        profile = self._profile()
+        if profile is not None and profile['statement_started'] is not None:
+            profile['sql'] += time.perf_counter() - profile['statement_started']
+            profile['sql_count'] += 1
+            profile['statements'][statement] += 1
+            profile['statement_started'] = None
+
+    def _start_render(self, sender, template, context, **extra):
+        profile = self._profile()
+        if profile is not None:
+            profile['renders'].append(time.perf_counter())
+
+    def _finish_render(self, sender, template, context, **extra):
+        profile = self._profile()
+        if profile is not None and profile['renders']:
+            started = profile['renders'].pop()
+            # Nested renders are already inside the outer render's time.
+            if not profile['renders']:
+                profile['template'] += time.perf_counter() - started
+
+request_profiler = RequestProfiler()
@@ -0,0 +1,17 @@
+from database import create_db_app
+from models import db
+from rollups import rebuild_revenue_rollups as rebuild
+
+def rebuild_revenue_rollups():
+    """
+    Recomputes the course/day and course/month revenue rollups from the fee
+    and payment tables, e.g. after deleting students or correcting payments.
+    """
+    app = create_db_app()
+    with app.app_context():
+        with db.engine.begin() as connection:
+            rebuild(connection)
+        print("Revenue rollups rebuilt.")
+
+if __name__ == '__main__':
+    rebuild_revenue_rollups()
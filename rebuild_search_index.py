@@ -0,0 +1,17 @@
+from database import create_db_app
+from models import db
+from search import rebuild_search_indexes
+
+def rebuild_search_index():
+    """
+    Creates the full-text search tables and triggers on an existing
+    database and repopulates them from the source tables.
+    """
+    app = create_db_app()
+    with app.app_context():
+        with db.engine.begin() as connection:
+            rebuild_search_indexes(connection)
+        print("Search indexes rebuilt.")
+
+if __name__ == '__main__':
+    rebuild_search_index()
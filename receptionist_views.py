@@ -0,0 +1,462 @@
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask_login import login_required, current_user
+from models import db, Student, Staff, Enquiry, Appointment, Fee
+from metrics import dashboard_metrics
+from search import search_hits
+from catalog import catalog
+import scheduling
+import enquiry_queue
+import installments
+import admissions
+from admission_import import CSV_COLUMNS, REQUIRED_COLUMNS, parse_admissions, import_admissions
+from view_helpers import parse_date, parse_time, log_action
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timedelta, date
+
+# --- Receptionist Portal Routes ---
+bp = Blueprint('receptionist', __name__)
+
+# Fees management pagination
+FEES_PAGE_SIZE = 50
+FEES_MAX_PAGE_SIZE = 200
+FREE_SLOT_SUGGESTIONS = 5
+ENQUIRY_PAGE_SIZE = 25
+COLLECTIONS_PAGE_SIZE = 50
+DUE_SOON_DAYS = 7
+
+@bp.route('/receptionist_portal')
+@login_required
+def receptionist_portal():
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+
+    # Only the selected tab's page is loaded; other statuses show just their count.
+    status = request.args.get('status', enquiry_queue.OPEN_STATUS)
+    if status not in enquiry_queue.STATUSES:
+        status = enquiry_queue.OPEN_STATUS
+    search_query = request.args.get('q', '')
+    enquiries = enquiry_queue.search_queue(status, search_query)
+    if enquiries is not None:
+        next_before = None
+    else:
+        before = request.args.get('before', type=int)
+        enquiries, next_before = enquiry_queue.queue_page(status, before, ENQUIRY_PAGE_SIZE)
+
+    return render_template(
+        'receptionist_portal.html',
+        current_user=current_user,
+        enquiries=enquiries,
+        status=status,
+        statuses=enquiry_queue.STATUSES,
+        status_counts=enquiry_queue.status_counts(db.session),
+        next_before=next_before,
+        search_query=search_query
+    )
+
+
+@bp.route('/receptionist_portal/add_enquiry', methods=['GET', 'POST'])
+@login_required
+def add_enquiry():
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+    
+    courses = catalog.courses()
+
+    if request.method == 'POST':
+        name = request.form.get('name')
+        contact = request.form.get('contact')
+        course = request.form.get('course_interest')
+        joining_date = parse_date(request.form.get('joining_date'))
+        
+        new_enquiry = Enquiry(
+            name=name,
+            contact=contact,
+            course_interest=course,
+            joining_date=joining_date
+        )
+        db.session.add(new_enquiry)
+        db.session.commit()
+        log_action(current_user, 'add_enquiry', f"Enquiry for {name} submitted.")
+        flash(f"Enquiry for {name} submitted successfully!", 'success')
+        return redirect(url_for('receptionist.receptionist_portal'))
+
+    return render_template('add_enquiry.html', courses=courses)
+
+@bp.route('/receptionist_portal/cancel_enquiry/<int:enquiry_id>')
+@login_required
+def cancel_enquiry(enquiry_id):
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+    
+    enquiry = db.session.get(Enquiry, enquiry_id)
+    if enquiry is None:
+        flash("Enquiry not found.", 'danger')
+        return redirect(url_for('receptionist.receptionist_portal'))
+        
+    enquiry.status = 'Cancelled'
+    db.session.commit()
+    log_action(current_user, 'cancel_enquiry', f"Enquiry for {enquiry.name} has been cancelled.")
+    flash(f"Enquiry for {enquiry.name} has been cancelled.", 'success')
+    return redirect(url_for('receptionist.receptionist_portal'))
+
+
+@bp.route('/receptionist_portal/admit_student/<int:enquiry_id>', methods=['GET', 'POST'])
+@login_required
+def admit_student(enquiry_id):
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+    
+    enquiry = db.session.get(Enquiry, enquiry_id)
+    if enquiry is None:
+        flash("Enquiry not found.", 'danger')
+        return redirect(url_for('receptionist.receptionist_portal'))
+        
+    courses = catalog.courses()
+
+    if request.method == 'POST':
+        if enquiry.status == 'Admitted':
+            flash("This enquiry has already been processed for admission.", 'warning')
+            return redirect(url_for('receptionist.receptionist_portal'))
+
+        student_name = request.form.get('student_name')
+        try:
+            date_of_admission = parse_date(request.form.get('date_of_admission'))
+            admissions.admit(request.form, date_of_admission, enquiry=enquiry)
+        except ValueError as error:
+            flash(str(error), 'danger')
+            return render_template('admit_student.html', enquiry=enquiry, courses=courses,
+                           discount=admissions.discount_percentage())
+        except SQLAlchemyError:
+            flash("Admission could not be saved. Please try again.", 'danger')
+            return render_template('admit_student.html', enquiry=enquiry, courses=courses,
+                           discount=admissions.discount_percentage())
+
+        log_action(current_user, 'admit_student', f"Admitted student '{student_name}' from enquiry ID {enquiry_id}.")
+        flash(f"Student '{student_name}' admitted successfully!", 'success')
+        return redirect(url_for('receptionist.receptionist_portal'))
+
+    return render_template('admit_student.html', enquiry=enquiry, courses=courses,
+                           discount=admissions.discount_percentage())
+
+
+@bp.route('/receptionist_portal/direct_admission', methods=['GET', 'POST'])
+@login_required
+def direct_admission():
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+    
+    courses = catalog.courses()
+
+    if request.method == 'POST':
+        name = request.form.get('student_name')
+        try:
+            date_of_admission = parse_date(request.form.get('date_of_admission'))
+            admissions.admit(request.form, date_of_admission)
+        except ValueError as error:
+            flash(str(error), 'danger')
+            return render_template('direct_admission.html', courses=courses, discount=admissions.discount_percentage())
+        except SQLAlchemyError:
+            flash("Admission could not be saved. Please try again.", 'danger')
+            return render_template('direct_admission.html', courses=courses, discount=admissions.discount_percentage())
+
+        log_action(current_user, 'direct_admission', f"Directly admitted student '{name}'.")
+        flash(f"Direct admission for {name} was successful!", 'success')
+        return redirect(url_for('receptionist.receptionist_portal'))
+
+    return render_template('direct_admission.html', courses=courses, discount=admissions.discount_percentage())
+
+
+@bp.route('/receptionist_portal/import_admissions', methods=['GET', 'POST'])
+@login_required
+def import_admissions_view():
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+
+    report = None
+    csv_text = ''
+    if request.method == 'POST':
+        if request.form.get('action') == 'import':
+            csv_text = request.form.get('csv_text', '')
+        else:
+            upload = request.files.get('csv_file')
+            csv_text = upload.read().decode('utf-8-sig') if upload else ''
+
+        rows, errors = parse_admissions(csv_text)
+        report = {'valid': len(rows), 'errors': errors}
+
+        if request.form.get('action') == 'import' and rows and not errors:
+            try:
+                admitted, payments = import_admissions(rows)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                flash("Import failed; no admissions were saved. Please try again.", 'danger')
+                return redirect(url_for('receptionist.import_admissions_view'))
+            dashboard_metrics.invalidate()
+            log_action(current_user, 'import_admissions', f"Imported {admitted} admission(s) with {payments} payment(s).")
+            flash(f"Imported {admitted} admission(s) successfully!", 'success')
+            return redirect(url_for('receptionist.receptionist_portal'))
+
+    return render_template(
+        'import_admissions.html',
+        report=report,
+        csv_text=csv_text,
+        columns=CSV_COLUMNS,
+        required=REQUIRED_COLUMNS,
+        discount=admissions.discount_percentage()
+    )
+
+
+@bp.route('/receptionist_portal/schedule_appointment', methods=['GET', 'POST'])
+@login_required
+def schedule_appointment():
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+    
+    staff_members = Staff.query.all()
+    form = request.form if request.method == 'POST' else request.args
+    staff_id = form.get('staff_id', type=int)
+
+    if request.method == 'POST':
+        visitor_name = request.form.get('visitor_name')
+        try:
+            new_appointment = Appointment(
+                visitor_name=visitor_name,
+                visitor_contact=request.form.get('visitor_contact'),
+                purpose=request.form.get('purpose'),
+                date=parse_date(request.form.get('date')),
+                time=parse_time(request.form.get('time')),
+                staff_id=staff_id
+            )
+            if None in (new_appointment.date, new_appointment.time, staff_id):
+                raise ValueError("Missing appointment details.")
+            scheduling.book(new_appointment)
+            db.session.commit()
+        except scheduling.SlotTaken as error:
+            db.session.rollback()
+            flash(str(error), 'danger')
+            return render_template(
+                'schedule_appointment.html',
+                staff_members=staff_members,
+                form=form,
+                conflict=str(error),
+                free_slots=scheduling.next_free_slots(staff_id, FREE_SLOT_SUGGESTIONS)
+            )
+        except ValueError:
+            db.session.rollback()
+            flash("Please choose a staff member and a valid date and time.", 'danger')
+            return redirect(url_for('receptionist.schedule_appointment'))
+
+        log_action(current_user, 'schedule_appointment', f"Scheduled an appointment for {visitor_name}.")
+        flash(f"Appointment for {visitor_name} scheduled successfully!", 'success')
+        return redirect(url_for('receptionist.receptionist_portal'))
+
+    return render_template(
+        'schedule_appointment.html',
+        staff_members=staff_members,
+        form=form,
+        conflict=None,
+        free_slots=scheduling.next_free_slots(staff_id, FREE_SLOT_SUGGESTIONS) if staff_id else []
+    )
+
+
+@bp.route('/receptionist_portal/free_slots')
+@login_required
+def free_slots():
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+
+    staff_id = request.args.get('staff_id', type=int)
+    if staff_id is None or db.session.get(Staff, staff_id) is None:
+        return jsonify({'error': 'Unknown staff member.'}), 404
+    count = min(max(request.args.get('count', FREE_SLOT_SUGGESTIONS, type=int), 1), 50)
+    try:
+        after = datetime.fromisoformat(request.args['after']) if request.args.get('after') else None
+    except ValueError:
+        return jsonify({'error': 'after must be an ISO date-time.'}), 400
+
+    slots = scheduling.next_free_slots(staff_id, count, after)
+    return jsonify({'staff_id': staff_id, 'slots': [slot.isoformat(timespec='minutes') for slot in slots]})
+
+
+@bp.route('/receptionist_portal/fees_management')
+@login_required
+def fees_management():
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+    
+    status_filter = request.args.get('status', '')
+    per_page = min(max(request.args.get('per_page', FEES_PAGE_SIZE, type=int), 1), FEES_MAX_PAGE_SIZE)
+    after = request.args.get('after', type=int)
+    before = request.args.get('before', type=int)
+
+    # One aggregate row per student straight from the stored ledger columns,
+    # paged on the student id so each page costs the same regardless of depth.
+    total_amount = db.func.sum(Fee.total_amount)
+    amount_paid = db.func.sum(Fee.amount_paid)
+    pending_amount = db.func.sum(Fee.pending_amount)
+    query = db.session.query(
+        Student.id,
+        Student.name,
+        Enquiry.course_interest,
+        total_amount.label('total_amount'),
+        amount_paid.label('amount_paid'),
+        pending_amount.label('pending_amount'),
+        db.case(
+            (pending_amount <= 0, 'paid'),
+            (db.func.sum(db.case((Fee.status == 'overdue', 1), else_=0)) > 0, 'overdue'),
+            (amount_paid > 0, 'partially_paid'),
+            else_='pending'
+        ).label('status')
+    ).join(Fee, Fee.student_id == Student.id).outerjoin(Enquiry, Student.enquiry_id == Enquiry.id)
+
+    if status_filter:
+        query = query.filter(Fee.status == status_filter)
+
+    # Grouping on the primary key alone keeps the rowid order, so LIMIT stops early.
+    query = query.group_by(Student.id)
+    if before is not None:
+        rows = query.filter(Student.id < before).order_by(Student.id.desc()).limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        rows = list(reversed(rows[:per_page]))
+        prev_cursor = rows[0].id if rows and has_more else None
+        next_cursor = rows[-1].id if rows else None
+    else:
+        if after is not None:
+            query = query.filter(Student.id > after)
+        rows = query.order_by(Student.id).limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        prev_cursor = rows[0].id if rows and after is not None else None
+        next_cursor = rows[-1].id if rows and has_more else None
+
+    return render_template(
+        'fees_management.html',
+        rows=rows,
+        status_filter=status_filter,
+        per_page=per_page,
+        prev_cursor=prev_cursor,
+        next_cursor=next_cursor
+    )
+
+
+@bp.route('/receptionist_portal/collections')
+@login_required
+def collections():
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+
+    view = request.args.get('view', 'due_soon')
+    if view not in ('due_soon', 'overdue'):
+        view = 'due_soon'
+    days = min(max(request.args.get('days', DUE_SOON_DAYS, type=int), 1), 90)
+    today = date.today()
+    if view == 'overdue':
+        date_from, date_to = None, today - timedelta(days=1)
+    else:
+        date_from, date_to = today, today + timedelta(days=days - 1)
+
+    after = None
+    cursor = request.args.get('cursor', '')
+    if cursor:
+        try:
+            cursor_date, cursor_id = cursor.rsplit('_', 1)
+            after = (date.fromisoformat(cursor_date), int(cursor_id))
+        except ValueError:
+            flash("Invalid page cursor.", 'danger')
+            return redirect(url_for('receptionist.collections', view=view, days=days))
+
+    rows, next_after = installments.collections_page(date_from, date_to, after, COLLECTIONS_PAGE_SIZE)
+    count, outstanding = installments.collections_total(date_from, date_to)
+    return render_template(
+        'collections.html',
+        rows=rows,
+        view=view,
+        days=days,
+        today=today,
+        count=count,
+        outstanding=outstanding,
+        next_cursor=f"{next_after[0].isoformat()}_{next_after[1]}" if next_after else None
+    )
+
+
+@bp.route('/receptionist_portal/record_payment/<int:student_id>', methods=['GET', 'POST'])
+@login_required
+def record_payment(student_id):
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+
+    fee_record = Fee.query.filter_by(student_id=student_id).first()
+    if fee_record is None:
+        flash("Fee record not found for this student.", 'danger')
+        return redirect(url_for('receptionist.fees_management'))
+        
+    student = db.session.get(Student, student_id)
+    if student is None:
+        flash("Student not found.", 'danger')
+        return redirect(url_for('receptionist.fees_management'))
+
+    if request.method == 'POST':
+        payment_amount = float(request.form.get('payment_amount'))
+        
+        fee_record.add_payment(payment_amount, date.today())
+        db.session.commit()
+        log_action(current_user, 'record_payment', f"Recorded a payment of ₹{payment_amount} for student '{student.name}'.")
+        flash(f"Payment of ₹{payment_amount} recorded for {student.name}.", 'success')
+        return redirect(url_for('receptionist.fees_management'))
+
+    return render_template('record_payment.html', fee_record=fee_record, student=student)
+
+
+@bp.route('/receptionist_portal/student_profile', methods=['GET', 'POST'])
+@bp.route('/receptionist_portal/student_profile/<int:student_id>')
+@login_required
+def student_profile(student_id=None):
+    if current_user.role != 'receptionist':
+        return redirect(url_for('auth.login'))
+
+    courses = catalog.courses()
+    
+    if student_id:
+        student = db.session.get(Student, student_id)
+        if student is None:
+            flash("Student not found.", 'danger')
+            return redirect(url_for('receptionist.student_profile'))
+            
+        fee_record = Fee.query.filter_by(student_id=student_id).first()
+        schedule = fee_record.installments if fee_record else []
+
+        # The next payment is due on the first installment not yet fully paid.
+        next_payment_date = next((installment.due_date for installment in schedule if installment.state != 'paid'), None)
+
+        return render_template(
+            'student_profile.html',
+            student=student,
+            fee_record=fee_record,
+            show_profile=True,
+            courses=courses,
+            schedule=schedule,
+            next_payment_date=next_payment_date
+        )
+    else:
+        students = []
+        if request.method == 'POST':
+            search_query = request.form.get('search_query')
+            course_filter = request.form.get('course_filter')
+            
+            base_query = Student.query.join(Enquiry).options(db.contains_eager(Student.enquiry))
+
+            within = None
+            if course_filter:
+                base_query = base_query.filter(Enquiry.course_interest == course_filter)
+                within = db.select(Student.id).join(Enquiry).where(Enquiry.course_interest == course_filter)
+
+            hits = search_hits('student_fts', search_query, within)
+            if hits is not None:
+                base_query = base_query.join(hits, hits.c.id == Student.id).order_by(hits.c.rank)
+                
+            students = base_query.all()
+        else:
+            students = Student.query.join(Enquiry).options(db.contains_eager(Student.enquiry)).all()
+
+        return render_template('student_profile.html', students=students, courses=courses, show_profile=False)
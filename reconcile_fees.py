@@ -0,0 +1,37 @@
+from database import create_db_app
+from models import db, User, AuditLog
+from fee_reconciliation import reconcile_fees as reconcile, describe_changes
+from migrations import upgrade_database
+from datetime import date, datetime
+import sys
+import time
+
+def reconcile_fees(batch_size=5000):
+    """
+    Recomputes every fee's ledger totals, installment allocation and status
+    (including overdue installments) with set-based UPDATEs, and records
+    the changes as a single audit log entry. Safe to run repeatedly and
+    while the app is serving; intended to run nightly from cron.
+    """
+    app = create_db_app()
+    with app.app_context():
+        upgrade_database()
+
+        started = time.perf_counter()
+        fees, ledgers, installments, changes = reconcile(db.engine, date.today(), batch_size)
+        elapsed = time.perf_counter() - started
+
+        summary = (f"Reconciled {fees} fee(s) in {elapsed:.1f}s: {ledgers} ledger total(s) and "
+                   f"{installments} installment(s) corrected; {describe_changes(changes)}.")
+        print(summary)
+
+        admin = User.query.filter_by(role='admin', is_active=True).order_by(User.id).first()
+        if admin is None:
+            print("No active admin user to record the audit log entry against.")
+            return
+        db.session.add(AuditLog(user_id=admin.id, action='reconcile_fees', details=summary[:500], timestamp=datetime.now()))
+        db.session.commit()
+
+if __name__ == '__main__':
+    # Usage: python reconcile_fees.py [batch_size]
+    reconcile_fees(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
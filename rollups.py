@@ -0,0 +1,77 @@
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from models import db, Enquiry, Student, Fee, Payment, RevenueRollup
+
+# --- Revenue Rollups ---
+# Fees are billed on the student's admission date (falling back to the
+# enquiry's joining date, then today) and collected on the payment date.
+# Both are folded into revenue_rollup rows per course and day/month with
+# SQLite upserts issued in the same transaction as the write that caused
+# them. Deletions are not tracked incrementally; rebuild_revenue_rollups()
+# recomputes everything from the source tables.
+
+GRANULARITIES = ('day', 'month')
+UNASSIGNED_COURSE = 'Unassigned'
+
+def _period_start(day, granularity):
+    if granularity == 'month':
+        return db.func.date(day, 'start of month')
+    return db.func.date(day)
+
+def _billed_select(granularity, *criteria):
+    day = db.func.coalesce(Student.date_of_admission, Enquiry.joining_date, db.func.date('now'))
+    course = db.func.coalesce(Enquiry.course_interest, UNASSIGNED_COURSE)
+    period_start = _period_start(day, granularity)
+    return db.select(
+        course, db.literal(granularity), period_start, db.func.sum(Fee.total_amount), db.literal(0.0)
+    ).select_from(Fee).join(Student, Fee.student_id == Student.id).outerjoin(
+        Enquiry, Student.enquiry_id == Enquiry.id
+    ).where(db.true(), *criteria).group_by(course, period_start)
+
+def _collected_select(granularity, *criteria):
+    course = db.func.coalesce(Enquiry.course_interest, UNASSIGNED_COURSE)
+    period_start = _period_start(Payment.payment_date, granularity)
+    return db.select(
+        course, db.literal(granularity), period_start, db.literal(0.0), db.func.sum(Payment.amount)
+    ).select_from(Payment).join(Fee, Payment.fee_id == Fee.id).join(Student, Fee.student_id == Student.id).outerjoin(
+        Enquiry, Student.enquiry_id == Enquiry.id
+    ).where(db.true(), *criteria).group_by(course, period_start)
+
+def _upsert(select):
+    table = RevenueRollup.__table__
+    statement = insert(table).from_select(
+        ['course', 'granularity', 'period_start', 'billed', 'collected'], select
+    )
+    return statement.on_conflict_do_update(
+        index_elements=['granularity', 'period_start', 'course'],
+        set_={
+            'billed': table.c.billed + statement.excluded.billed,
+            'collected': table.c.collected + statement.excluded.collected,
+        }
+    )
+
+def apply_fees(connection, fee_ids):
+    for granularity in GRANULARITIES:
+        connection.execute(_upsert(_billed_select(granularity, Fee.id.in_(fee_ids))))
+
+def apply_payments(connection, payment_ids):
+    for granularity in GRANULARITIES:
+        connection.execute(_upsert(_collected_select(granularity, Payment.id.in_(payment_ids))))
+
+def rebuild_revenue_rollups(connection):
+    """Recomputes every rollup row from fees and payments."""
+    connection.execute(RevenueRollup.__table__.delete())
+    for granularity in GRANULARITIES:
+        connection.execute(_upsert(_billed_select(granularity)))
+        connection.execute(_upsert(_collected_select(granularity)))
+
+@event.listens_for(Session, 'after_flush')
+def _update_revenue_rollups(session, flush_context):
+    fee_ids = [obj.id for obj in session.new if isinstance(obj, Fee)]
+    payment_ids = [obj.id for obj in session.new if isinstance(obj, Payment)]
+    if fee_ids:
+        apply_fees(session.connection(), fee_ids)
+    if payment_ids:
+        apply_payments(session.connection(), payment_ids)
@@ -0,0 +1,112 @@
+from bisect import bisect_left
+from datetime import datetime, time, timedelta
+
+from flask import current_app
+
+from models import db, Appointment, Staff
+
+# --- Staff Calendar Engine ---
+# Appointments occupy a fixed APPOINTMENT_SLOT_MINUTES slot starting at
+# their time; free slots are offered within OFFICE_HOURS. A StaffCalendar
+# loads only the requested date range, using the (staff_id, date, time)
+# index, into one sorted list of start times per staff member, so conflict
+# checks and free-slot searches are binary searches however many years of
+# history the table holds.
+
+FREE_SLOT_HORIZON_DAYS = 30
+CALENDAR_DAYS = 7        # days shown on a calendar page by default
+CALENDAR_MAX_DAYS = 31
+
+class SlotTaken(ValueError):
+    pass
+
+def slot_length():
+    return timedelta(minutes=current_app.config.get('APPOINTMENT_SLOT_MINUTES', 30))
+
+def office_hours():
+    return current_app.config.get('OFFICE_HOURS', (time(9, 0), time(18, 0)))
+
+class StaffCalendar:
+    def __init__(self, date_from, date_to, staff_ids=None):
+        """Loads appointments dated date_from..date_to inclusive, optionally for some staff only."""
+        self.date_from = date_from
+        self.date_to = date_to
+        query = Appointment.query.options(db.selectinload(Appointment.staff)).filter(
+            Appointment.date.between(date_from, date_to)
+        )
+        if staff_ids is not None:
+            query = query.filter(Appointment.staff_id.in_(staff_ids))
+        appointments = query.order_by(Appointment.date, Appointment.time).all()
+
+        self.appointments = appointments
+        self._starts = {}
+        for appointment in appointments:
+            self._starts.setdefault(appointment.staff_id, []).append(
+                datetime.combine(appointment.date, appointment.time)
+            )
+
+    def conflicts(self, staff_id, start):
+        """True if a slot starting at start overlaps one of the staff member's appointments."""
+        starts = self._starts.get(staff_id, [])
+        slot = slot_length()
+        # The first appointment starting after start - slot is the only
+        # one that can overlap; anything earlier has ended by start.
+        index = bisect_left(starts, start - slot + timedelta(microseconds=1))
+        return index < len(starts) and starts[index] < start + slot
+
+    def free_slots(self, staff_id, after, count):
+        """The next count free slot start times within office hours, from after onwards."""
+        slots = []
+        length = slot_length()
+        opening, closing = office_hours()
+        day = max(after.date(), self.date_from)
+        while day <= self.date_to and len(slots) < count:
+            slot = datetime.combine(day, opening)
+            while slot + length <= datetime.combine(day, closing) and len(slots) < count:
+                if slot >= after and not self.conflicts(staff_id, slot):
+                    slots.append(slot)
+                slot += length
+            day += timedelta(days=1)
+        return slots
+
+    def by_day(self):
+        """Appointments grouped into (day, [appointments]) pairs for each day in range."""
+        days = {}
+        for appointment in self.appointments:
+            days.setdefault(appointment.date, []).append(appointment)
+        return sorted(days.items())
+
+def next_free_slots(staff_id, count=5, after=None):
+    after = after or datetime.now()
+    calendar = StaffCalendar(after.date(), after.date() + timedelta(days=FREE_SLOT_HORIZON_DAYS), [staff_id])
+    return calendar.free_slots(staff_id, after, count)
+
+def book(appointment):
+    """
+    Adds the appointment to the session, flushes and re-checks the staff
+    member's day inside the write transaction, so two desks booking the
+    same slot at once cannot both succeed. Raises SlotTaken; the caller
+    rolls back on error and commits on success.
+    """
+    db.session.add(appointment)
+    db.session.flush()
+    start = datetime.combine(appointment.date, appointment.time)
+    slot = slot_length()
+    # Same-day appointments starting strictly less than one slot either side.
+    window_start = max(start - slot + timedelta(microseconds=1), datetime.combine(appointment.date, time.min))
+    window_end = min(start + slot, datetime.combine(appointment.date, time.max))
+    clash = db.session.query(Appointment.id).filter(
+        Appointment.staff_id == appointment.staff_id,
+        Appointment.date == appointment.date,
+        Appointment.time >= window_start.time(),
+        Appointment.time < window_end.time(),
+        Appointment.id != appointment.id
+    ).first()
+    if clash is not None:
+        raise SlotTaken(f"{appointment.staff.name if appointment.staff else 'This staff member'} "
+                        f"already has an appointment within {int(slot.total_seconds() // 60)} minutes of "
+                        f"{appointment.time.strftime('%H:%M')} on {appointment.date}.")
+    return appointment
+
+def staff_for_user(user_id):
+    return Staff.query.filter_by(user_id=user_id).first()
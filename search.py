@@ -0,0 +1,155 @@
+import re
+
+from sqlalchemy import event
+
+from models import db
+
+# --- Full-Text Search ---
+# SQLite FTS5 indexes over the searchable name/contact columns. Each index
+# uses the source row id as its rowid and is kept in sync by triggers, so
+# every write path (ORM, bulk SQL, scripts) updates it. The indexes are
+# created with the schema and populated on first creation.
+
+SEARCH_LIMIT = 200
+
+_USER_ROW = '''
+    INSERT INTO user_fts(rowid, username, name)
+    SELECT u.id, u.username, COALESCE(s.name, r.name, '')
+    FROM "user" u
+    LEFT JOIN staff s ON s.user_id = u.id
+    LEFT JOIN receptionist r ON r.user_id = u.id
+    WHERE u.id = {user_id};
+'''
+
+SEARCH_INDEXES = {
+    'student_fts': {
+        'columns': 'name, father_name, contact_no, father_contact_no',
+        'populate': '''
+            INSERT INTO student_fts(rowid, name, father_name, contact_no, father_contact_no)
+            SELECT id, name, father_name, contact_no, father_contact_no FROM student
+        ''',
+        'triggers': [
+            '''CREATE TRIGGER IF NOT EXISTS student_fts_insert AFTER INSERT ON student BEGIN
+                INSERT INTO student_fts(rowid, name, father_name, contact_no, father_contact_no)
+                VALUES (new.id, new.name, new.father_name, new.contact_no, new.father_contact_no);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS student_fts_update
+            AFTER UPDATE OF name, father_name, contact_no, father_contact_no ON student BEGIN
+                DELETE FROM student_fts WHERE rowid = old.id;
+                INSERT INTO student_fts(rowid, name, father_name, contact_no, father_contact_no)
+                VALUES (new.id, new.name, new.father_name, new.contact_no, new.father_contact_no);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS student_fts_delete AFTER DELETE ON student BEGIN
+                DELETE FROM student_fts WHERE rowid = old.id;
+            END''',
+        ],
+    },
+    'enquiry_fts': {
+        'columns': 'name, contact',
+        'populate': '''
+            INSERT INTO enquiry_fts(rowid, name, contact) SELECT id, name, contact FROM enquiry
+        ''',
+        'triggers': [
+            '''CREATE TRIGGER IF NOT EXISTS enquiry_fts_insert AFTER INSERT ON enquiry BEGIN
+                INSERT INTO enquiry_fts(rowid, name, contact) VALUES (new.id, new.name, new.contact);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS enquiry_fts_update AFTER UPDATE OF name, contact ON enquiry BEGIN
+                DELETE FROM enquiry_fts WHERE rowid = old.id;
+                INSERT INTO enquiry_fts(rowid, name, contact) VALUES (new.id, new.name, new.contact);
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS enquiry_fts_delete AFTER DELETE ON enquiry BEGIN
+                DELETE FROM enquiry_fts WHERE rowid = old.id;
+            END''',
+        ],
+    },
+    'user_fts': {
+        'columns': 'username, name',
+        'populate': _USER_ROW.replace('WHERE u.id = {user_id};', ''),
+        'triggers': [
+            f'''CREATE TRIGGER IF NOT EXISTS user_fts_insert AFTER INSERT ON "user" BEGIN
+                {_USER_ROW.format(user_id='new.id')}
+            END''',
+            f'''CREATE TRIGGER IF NOT EXISTS user_fts_update AFTER UPDATE OF username ON "user" BEGIN
+                DELETE FROM user_fts WHERE rowid = old.id;
+                {_USER_ROW.format(user_id='new.id')}
+            END''',
+            '''CREATE TRIGGER IF NOT EXISTS user_fts_delete AFTER DELETE ON "user" BEGIN
+                DELETE FROM user_fts WHERE rowid = old.id;
+            END''',
+        ] + [
+            trigger
+            for profile in ('staff', 'receptionist')
+            for trigger in (
+                f'''CREATE TRIGGER IF NOT EXISTS user_fts_{profile}_insert AFTER INSERT ON {profile} BEGIN
+                    DELETE FROM user_fts WHERE rowid = new.user_id;
+                    {_USER_ROW.format(user_id='new.user_id')}
+                END''',
+                f'''CREATE TRIGGER IF NOT EXISTS user_fts_{profile}_update AFTER UPDATE OF name, user_id ON {profile} BEGIN
+                    DELETE FROM user_fts WHERE rowid IN (old.user_id, new.user_id);
+                    {_USER_ROW.format(user_id='old.user_id AND old.user_id != new.user_id')}
+                    {_USER_ROW.format(user_id='new.user_id')}
+                END''',
+                f'''CREATE TRIGGER IF NOT EXISTS user_fts_{profile}_delete AFTER DELETE ON {profile} BEGIN
+                    DELETE FROM user_fts WHERE rowid = old.user_id;
+                    {_USER_ROW.format(user_id='old.user_id')}
+                END''',
+            )
+        ],
+    },
+}
+
+def install_search_indexes(connection):
+    """Creates any missing FTS tables and triggers, populating new tables."""
+    if connection.dialect.name != 'sqlite':
+        return
+    existing = {row[0] for row in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for index, spec in SEARCH_INDEXES.items():
+        if index not in existing:
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {index} USING fts5({spec['columns']}, prefix='2 3')"
+            )
+            connection.exec_driver_sql(spec['populate'])
+        for trigger in spec['triggers']:
+            connection.exec_driver_sql(trigger)
+
+def rebuild_search_indexes(connection):
+    """Repopulates every FTS table from its source tables."""
+    install_search_indexes(connection)
+    for index, spec in SEARCH_INDEXES.items():
+        connection.exec_driver_sql(f"DELETE FROM {index}")
+        connection.exec_driver_sql(spec['populate'])
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_search_indexes(target, connection, **kw):
+    install_search_indexes(connection)
+
+def fts_query(text):
+    """
+    Turns free text into an FTS5 query where every word must match as a
+    prefix, e.g. 'ravi kum' -> '"ravi"* "kum"*'. Returns None if the text
+    has nothing searchable.
+    """
+    terms = re.findall(r'\w+', text or '')
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def search_hits(index, text, within=None, limit=SEARCH_LIMIT):
+    """
+    Returns a subquery of (id, rank) for the best matching rows of an FTS
+    index, or None if text is empty. Join it to the source table on id and
+    order by rank for relevance ordering. within is an optional select of
+    source ids carrying the page's filters (e.g. a course or role); it is
+    checked per match inside the ranked query, so the limit counts only
+    rows that pass the filters.
+    """
+    query = fts_query(text)
+    if query is None:
+        return None
+    fts = db.table(index, db.column('rowid'), db.column('rank'))
+    hits = db.select(fts.c.rowid.label('id'), fts.c.rank.label('rank')).where(
+        db.literal_column(index).op('MATCH')(query)
+    )
+    if within is not None:
+        hits = hits.where(within.where(within.selected_columns[0] == fts.c.rowid).exists())
+    return hits.order_by(fts.c.rank).limit(limit).subquery()
@@ -0,0 +1,247 @@
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta, time as clock_time
+
+from app import create_initial_data
+from database import create_db_app
+from models import db, User, Staff, Receptionist, Enquiry, Student, Course, Subject, Appointment, Fee, Installment, \
+    Payment, AuditLog, password_hasher
+import enquiry_queue
+import installments
+import rollups
+
+# --- Synthetic Data Seeder ---
+# Fills a database with realistic volumes of courses, staff, enquiries,
+# admitted students with fees, installment schedules and payments,
+# appointments and audit logs, to reproduce production-scale behaviour
+# locally. Output is fully determined by --seed and --as-of. Rows are
+# appended after any existing data with core bulk inserts, one transaction
+# per chunk of students; like import_admissions(), the derived tables the
+# ORM hooks would maintain (enquiry status counts, revenue rollups) are
+# rebuilt at the end. The search index triggers fire as usual.
+#
+# Logins are the usual admin_user / staff_user / receptionist_user
+# accounts; the extra staff accounts share the password 'staff_password'.
+#
+# Usage: python seed_data.py [--students 50000] [--payments 500000] [--seed 1] ...
+# Point DATABASE_URL at a scratch database first; nothing asks for confirmation.
+
+COURSES = [
+    ('JEE Main', 90000), ('JEE Advanced', 120000), ('NEET', 110000), ('Foundation IX', 45000),
+    ('Foundation X', 50000), ('CUET', 40000), ('Olympiad', 30000), ('Board XII Science', 60000),
+]
+SUBJECTS = ['Physics', 'Chemistry', 'Mathematics', 'Biology', 'English', 'Reasoning']
+FIRST_NAMES = ['Aarav', 'Vivaan', 'Aditya', 'Vihaan', 'Arjun', 'Sai', 'Reyansh', 'Krishna', 'Ishaan', 'Rohan',
+               'Ananya', 'Diya', 'Aadhya', 'Saanvi', 'Myra', 'Anika', 'Pari', 'Riya', 'Kavya', 'Meera']
+LAST_NAMES = ['Sharma', 'Verma', 'Gupta', 'Singh', 'Kumar', 'Patel', 'Reddy', 'Iyer', 'Nair', 'Das',
+              'Joshi', 'Mehta', 'Chopra', 'Bose', 'Rao', 'Mishra', 'Yadav', 'Jain', 'Agarwal', 'Pandey']
+QUALIFICATIONS = ['Class 8', 'Class 9', 'Class 10', 'Class 11', 'Class 12', 'Dropper']
+CITIES = ['Kota', 'Jaipur', 'Delhi', 'Lucknow', 'Patna', 'Indore', 'Pune', 'Hyderabad']
+INSTALLMENT_COUNTS = [2, 3, 4, 6, 12]
+AUDIT_ACTIONS = ['login', 'logout', 'record_payment', 'add_enquiry', 'admit_student', 'edit_student',
+                 'schedule_appointment', 'cancel_enquiry']
+VISIT_PURPOSES = ['Admission counselling', 'Fee discussion', 'Parent meeting', 'Doubt session', 'Course change']
+
+def _next_id(connection, model):
+    return (connection.execute(db.select(db.func.max(model.id))).scalar() or 0) + 1
+
+def _person(rng):
+    return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+
+def _phone(rng):
+    return str(rng.randint(6000000000, 9999999999))
+
+def _insert(connection, model, rows, chunk_size=10000):
+    for start in range(0, len(rows), chunk_size):
+        connection.execute(db.insert(model), rows[start:start + chunk_size])
+
+def seed_accounts(rng, staff_count):
+    """Gives the initial users their profiles and adds extra staff; returns (user ids, staff ids)."""
+    staff_user = User.query.filter_by(username='staff_user').first()
+    if staff_user is not None and staff_user.staff_profile is None:
+        db.session.add(Staff(name='Staff Member', user_id=staff_user.id))
+    receptionist_user = User.query.filter_by(username='receptionist_user').first()
+    if receptionist_user is not None and receptionist_user.receptionist_profile is None:
+        db.session.add(Receptionist(name='Front Desk', user_id=receptionist_user.id))
+
+    # One hash for every seeded account; hashing is deliberately slow.
+    password_hash = password_hasher.hash('staff_password')
+    # Suffixes follow the ids, so they never repeat after accounts are deleted.
+    first = _next_id(db.session, User)
+    for n in range(first, first + staff_count):
+        user = User(username=f'seed_staff_{n}', role='staff', password_hash=password_hash)
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Staff(name=_person(rng), user_id=user.id))
+    db.session.commit()
+    return ([user_id for (user_id,) in db.session.query(User.id)],
+            [staff_id for (staff_id,) in db.session.query(Staff.id)])
+
+def seed_courses():
+    """Adds the missing courses and subjects through the ORM so the catalog cache is bumped."""
+    existing = {name for (name,) in db.session.query(Course.name)}
+    for name, _ in COURSES:
+        if name not in existing:
+            db.session.add(Course(name=name, subjects=[Subject(name=subject) for subject in SUBJECTS[:4]]))
+    db.session.commit()
+
+def seed_students(connection, rng, count, payment_count, as_of, years):
+    """Admits count students with fees, schedules and payment_count payments in total."""
+    enquiry_id, student_id, fee_id, payment_id = (
+        _next_id(connection, model) for model in (Enquiry, Student, Fee, Payment)
+    )
+    per_fee, extra = divmod(payment_count, count) if count else (0, 0)
+    enquiries, students, fees, schedules, payments = [], [], [], [], []
+
+    for n in range(count):
+        course, total = rng.choice(COURSES)
+        admitted_on = as_of - timedelta(days=rng.randint(0, 365 * years))
+        name = _person(rng)
+        contact = _phone(rng)
+        plan = 'full_payment' if rng.random() < 0.4 else 'installments'
+        num_installments = rng.choice(INSTALLMENT_COUNTS) if plan == 'installments' else None
+
+        # Payment amounts split what has been paid so far; roughly a third
+        # of the fees are settled in full.
+        count_paid = per_fee + (1 if n < extra else 0)
+        paid_total = 0.0
+        if count_paid:
+            paid_total = total if rng.random() < 0.35 else round(total * rng.uniform(0.05, 0.95), 2)
+            share = round(paid_total / count_paid, 2)
+            span = min(365, (as_of - admitted_on).days)
+            days = sorted(rng.randint(0, span) for _ in range(count_paid))
+            for i, day in enumerate(days):
+                amount = share if i < count_paid - 1 else round(paid_total - share * (count_paid - 1), 2)
+                payments.append({
+                    'id': payment_id + len(payments),
+                    'fee_id': fee_id + n,
+                    'amount': amount,
+                    'payment_date': admitted_on + timedelta(days=day),
+                    'notes': rng.choice(['Cash', 'UPI', 'Cheque', None]),
+                })
+        if paid_total >= total:
+            status = 'paid'
+        elif paid_total > 0:
+            status = 'partially_paid'
+        else:
+            status = 'pending'
+
+        enquiries.append({
+            'id': enquiry_id + n, 'name': name, 'contact': contact, 'course_interest': course,
+            'status': 'Admitted', 'joining_date': admitted_on,
+        })
+        students.append({
+            'id': student_id + n, 'name': name, 'father_name': _person(rng),
+            'qualification': rng.choice(QUALIFICATIONS), 'contact_no': contact, 'father_contact_no': _phone(rng),
+            'dob': (admitted_on - timedelta(days=rng.randint(14 * 365, 19 * 365))).isoformat(),
+            'full_address': f'{rng.randint(1, 999)}, Sector {rng.randint(1, 60)}, {rng.choice(CITIES)}',
+            'exam_type': course, 'target_exam': course, 'date_of_admission': admitted_on,
+            'enquiry_id': enquiry_id + n,
+        })
+        fees.append({
+            'id': fee_id + n, 'student_id': student_id + n, 'total_amount': float(total),
+            'payment_plan': plan, 'num_installments': num_installments, 'status': status,
+            'amount_paid': paid_total, 'pending_amount': total - paid_total,
+            'last_paid_date': payments[-1]['payment_date'] if count_paid else None,
+        })
+        schedules.append({
+            'id': fee_id + n, 'total_amount': float(total), 'payment_plan': plan,
+            'num_installments': num_installments, 'amount_paid': paid_total, 'start': admitted_on,
+        })
+
+    installment_rows = installments.rows_for_fees(schedules)
+    overdue_fee_ids = {row['fee_id'] for row in installment_rows if row['state'] != 'paid' and row['due_date'] < as_of}
+    for fee in fees:
+        if fee['id'] in overdue_fee_ids and fee['status'] != 'paid':
+            fee['status'] = 'overdue'
+    for model, rows in ((Enquiry, enquiries), (Student, students), (Fee, fees), (Installment, installment_rows),
+                        (Payment, payments)):
+        _insert(connection, model, rows)
+    return len(payments), len(installment_rows)
+
+def seed_open_enquiries(connection, rng, count, as_of):
+    enquiry_id = _next_id(connection, Enquiry)
+    _insert(connection, Enquiry, [{
+        'id': enquiry_id + n, 'name': _person(rng), 'contact': _phone(rng),
+        'course_interest': rng.choice(COURSES)[0], 'status': 'New' if rng.random() < 0.7 else 'Cancelled',
+        'joining_date': as_of + timedelta(days=rng.randint(0, 60)) if rng.random() < 0.3 else None,
+    } for n in range(count)])
+
+def seed_appointments(connection, rng, count, staff_ids, as_of):
+    """Books distinct (staff, day, slot) appointments within 90 days either side of as_of."""
+    slots = [clock_time(hour, minute) for hour in range(9, 18) for minute in (0, 30)]
+    days = 181
+    picks = rng.sample(range(len(staff_ids) * days * len(slots)), min(count, len(staff_ids) * days * len(slots)))
+    rows = []
+    for pick in picks:
+        staff_index, rest = divmod(pick, days * len(slots))
+        day, slot = divmod(rest, len(slots))
+        rows.append({
+            'visitor_name': _person(rng), 'visitor_contact': _phone(rng), 'purpose': rng.choice(VISIT_PURPOSES),
+            'date': as_of + timedelta(days=day - 90), 'time': slots[slot], 'staff_id': staff_ids[staff_index],
+        })
+    _insert(connection, Appointment, rows)
+    return len(rows)
+
+def seed_audit_logs(connection, rng, count, user_ids, as_of):
+    """Spreads count log entries over the year before as_of, oldest first."""
+    end = datetime.combine(as_of, clock_time(20, 0))
+    offsets = sorted(rng.randint(0, 365 * 24 * 3600) for _ in range(count))
+    _insert(connection, AuditLog, [{
+        'user_id': rng.choice(user_ids), 'action': rng.choice(AUDIT_ACTIONS), 'details': 'Seeded.',
+        'timestamp': end - timedelta(seconds=365 * 24 * 3600 - offset),
+    } for offset in offsets])
+
+def seed(students, payments, enquiries, appointments, audit_logs, staff, seed_value, as_of, years, chunk_size):
+    rng = random.Random(seed_value)
+    app = create_db_app()
+    create_initial_data(app)
+    with app.app_context():
+        started = time.perf_counter()
+        user_ids, staff_ids = seed_accounts(rng, staff)
+        seed_courses()
+
+        seeded_payments = seeded_installments = 0
+        for start in range(0, students, chunk_size):
+            chunk = min(chunk_size, students - start)
+            # Spread the payments over the chunks in proportion.
+            chunk_payments = payments * (start + chunk) // students - payments * start // students
+            with db.engine.begin() as connection:
+                added_payments, added_installments = seed_students(connection, rng, chunk, chunk_payments, as_of, years)
+            seeded_payments += added_payments
+            seeded_installments += added_installments
+            print(f"  {start + chunk}/{students} students")
+
+        with db.engine.begin() as connection:
+            seed_open_enquiries(connection, rng, enquiries, as_of)
+            seeded_appointments = seed_appointments(connection, rng, appointments, staff_ids, as_of)
+            seed_audit_logs(connection, rng, audit_logs, user_ids, as_of)
+        with db.engine.begin() as connection:
+            enquiry_queue.rebuild_status_counts(connection)
+            rollups.rebuild_revenue_rollups(connection)
+        with db.engine.connect() as connection:
+            connection.exec_driver_sql('ANALYZE')
+
+        print(f"Seeded {students} students, {seeded_payments} payments, {seeded_installments} installments, "
+              f"{students + enquiries} enquiries, {seeded_appointments} appointments and {audit_logs} audit logs "
+              f"in {time.perf_counter() - started:.1f}s.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic data.")
+    parser.add_argument('--students', type=int, default=50000)
+    parser.add_argument('--payments', type=int, default=500000)
+    parser.add_argument('--enquiries', type=int, default=None, help="open and cancelled enquiries (default students / 2)")
+    parser.add_argument('--appointments', type=int, default=20000)
+    parser.add_argument('--audit-logs', type=int, default=200000)
+    parser.add_argument('--staff', type=int, default=10, help="extra staff accounts")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--as-of', type=date.fromisoformat, default=date.today(), help="'today' for the data (YYYY-MM-DD)")
+    parser.add_argument('--years', type=int, default=3, help="admissions are spread over this many years")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="students per transaction")
+    args = parser.parse_args()
+    seed(args.students, args.payments, args.students // 2 if args.enquiries is None else args.enquiries,
+         args.appointments, args.audit_logs, args.staff, args.seed, args.as_of, args.years, args.chunk_size)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import sys
+
+from app import create_app, create_initial_data
+from models import db
+
+# --- Production Server ---
+# Runs the app under gunicorn's pre-fork server (pip install gunicorn).
+# The master builds the app and upgrades the schema once, then forks the
+# workers, which share the loaded code copy-on-write. Each worker drops the
+# database connections it inherited and opens its own; the audit writer and
+# the password hashing pool already start per process on first use.
+#
+# Usage: python serve.py [--bind 0.0.0.0:8000] [--workers N] [--threads N]
+# The same options can be set with the WEB_BIND, WEB_WORKERS and
+# WEB_THREADS environment variables.
+
+def default_workers():
+    return int(os.environ.get('WEB_WORKERS', (os.cpu_count() or 1) * 2 + 1))
+
+def post_fork(server, worker):
+    # Pooled SQLite connections must not be shared across processes.
+    with worker.app.application.app_context():
+        db.engine.dispose(close=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the app under gunicorn.")
+    parser.add_argument('--bind', default=os.environ.get('WEB_BIND', '0.0.0.0:8000'))
+    parser.add_argument('--workers', type=int, default=default_workers())
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', 4)))
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('WEB_TIMEOUT', 30)))
+    args = parser.parse_args()
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        sys.exit("gunicorn is not installed; run 'pip install gunicorn' or use 'python app.py' for development.")
+
+    class Server(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    application = create_app()
+    create_initial_data(application)
+    Server(application, {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'gthread' if args.threads > 1 else 'sync',
+        'timeout': args.timeout,
+        'preload_app': True,
+        'post_fork': post_fork,
+    }).run()
+
+if __name__ == '__main__':
+    main()
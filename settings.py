@@ -0,0 +1,72 @@
+import json
+import threading
+
+from models import db, Setting
+from cache_versions import VersionCheck, track
+
+# --- Institutional Settings ---
+# Settings live in the setting table so every worker process sees the same
+# values and they survive restarts. Each process keeps all of them in
+# memory, tagged with the 'settings' row of cache_version (see
+# cache_versions.py). A write reaches the writing process at once and every
+# other worker within CACHE_VERSION_CHECK_SECONDS; in between, reads cost
+# no queries.
+
+SETTINGS_VERSION = 'settings'
+
+DEFAULTS = {
+    'global_discount_percentage': 0.0,
+}
+
+class SettingsCache:
+    def __init__(self, defaults, check_interval=5):
+        self.defaults = dict(defaults)
+        self._check = VersionCheck(SETTINGS_VERSION, check_interval)
+        self._values = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self._check.interval = app.config.get('CACHE_VERSION_CHECK_SECONDS', self._check.interval)
+
+    def get(self, key):
+        return self.all()[key]
+
+    def all(self):
+        """Every setting, with defaults for those never saved. Treat the dict as read-only."""
+        if self._check.moved():
+            self.invalidate()
+        with self._lock:
+            values, generation = self._values, self._generation
+        if values is not None:
+            return values
+
+        values = self._load()
+        with self._lock:
+            # Don't store values loaded before a concurrent invalidation.
+            if generation == self._generation:
+                self._values = values
+        return values
+
+    def set(self, key, value):
+        """Stages a new value in the session; the caller commits."""
+        if key not in self.defaults:
+            raise KeyError(f"Unknown setting '{key}'.")
+        value = type(self.defaults[key])(value)
+        db.session.merge(Setting(key=key, value=json.dumps(value)))
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._values = None
+
+    def _load(self):
+        values = dict(self.defaults)
+        for key, value in db.session.execute(db.select(Setting.key, Setting.value)):
+            if key in values:
+                values[key] = json.loads(value)
+        return values
+
+settings = SettingsCache(DEFAULTS)
+track(SETTINGS_VERSION, (Setting,), settings.invalidate)
@@ -0,0 +1,23 @@
+from flask import Blueprint, render_template, redirect, url_for
+from flask_login import login_required, current_user
+import scheduling
+from datetime import timedelta, date
+
+# --- Staff Portal Routes ---
+bp = Blueprint('staff', __name__)
+
+@bp.route('/staff_portal')
+@login_required
+def staff_portal():
+    if current_user.role != 'staff':
+        return redirect(url_for('auth.login'))
+
+    staff = scheduling.staff_for_user(current_user.id)
+    start = date.today()
+    calendar_days = []
+    if staff is not None:
+        calendar = scheduling.StaffCalendar(start, start + timedelta(days=scheduling.CALENDAR_DAYS - 1), [staff.id])
+        calendar_days = calendar.by_day()
+    return render_template('staff_portal.html', current_user=current_user, staff=staff,
+                           calendar_days=calendar_days, start=start,
+                           end=start + timedelta(days=scheduling.CALENDAR_DAYS - 1))
@@ -0,0 +1,89 @@
+import threading
+import time
+
+from flask_login import UserMixin
+
+from models import db, User, Staff, Receptionist
+from cache_versions import VersionCheck, track
+
+# --- Logged-in User Cache ---
+# Flask-Login reloads the user on every authenticated request. The cache
+# keeps a small read-only snapshot per user id (role, active flag and
+# profile name, loaded in one query) for USER_CACHE_TTL seconds, so a warm
+# lookup costs no queries. Any flush that changes a User, Staff or
+# Receptionist bumps the 'users' row of cache_version (see
+# cache_versions.py) from any entry point; a rehashed password alone does
+# not, as the snapshot holds no hash. Each process drops every snapshot
+# when it sees the version move, at most CACHE_VERSION_CHECK_SECONDS after
+# the write, so a deactivated or deleted user is refused by every worker
+# within that time. The TTL only bounds staleness from raw SQL writes.
+
+USERS_VERSION = 'users'
+
+class CachedUser(UserMixin):
+    """Detached stand-in for User as current_user; safe to share between requests."""
+
+    def __init__(self, id, username, role, active, name):
+        self.id = id
+        self.username = username
+        self.role = role
+        self.active = active
+        self.name = name
+
+    @property
+    def is_active(self):
+        return self.active
+
+    def __repr__(self):
+        return f"User('{self.username}', '{self.role}')"
+
+class UserCache:
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._entries = {}
+        self._generation = 0
+        self._check = VersionCheck(USERS_VERSION)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('USER_CACHE_TTL', self.ttl)
+        self._check.interval = app.config.get('CACHE_VERSION_CHECK_SECONDS', self._check.interval)
+
+    def get(self, user_id):
+        """Returns the cached snapshot for user_id, or None if there is no such user."""
+        if self._check.moved():
+            self.invalidate()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            generation = self._generation
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+
+        user = self._load(user_id)
+        with self._lock:
+            # Don't store a snapshot loaded before a concurrent invalidation.
+            if user is not None and generation == self._generation:
+                self._entries[user_id] = (user, time.monotonic())
+        return user
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def _load(self, user_id):
+        row = db.session.execute(
+            db.select(
+                User.id, User.username, User.role, User.is_active,
+                db.func.coalesce(Staff.name, Receptionist.name)
+            ).outerjoin(Staff, Staff.user_id == User.id).outerjoin(
+                Receptionist, Receptionist.user_id == User.id
+            ).where(User.id == user_id)
+        ).first()
+        return CachedUser(*row) if row is not None else None
+
+user_cache = UserCache()
+track(USERS_VERSION, (User, Staff, Receptionist), user_cache.invalidate, ignore=('password_hash',))
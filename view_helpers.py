@@ -0,0 +1,16 @@
+from datetime import date, time
+
+from audit import audit_writer
+
+# --- Form Helpers ---
+def parse_date(value):
+    """Parses an HTML date input ('YYYY-MM-DD'); empty values become None."""
+    return date.fromisoformat(value) if value else None
+
+def parse_time(value):
+    """Parses an HTML time input ('HH:MM' or 'HH:MM:SS'); empty values become None."""
+    return time.fromisoformat(value) if value else None
+
+# --- Auditing Function ---
+def log_action(user, action, details):
+    audit_writer.log(user, action, details)
@@ -0,0 +1,5 @@
+from app import create_app
+
+# WSGI entry point for servers that import the app themselves,
+# e.g. gunicorn wsgi:app. serve.py wraps this with sensible defaults.
+app = create_app()